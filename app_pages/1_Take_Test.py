@@ -0,0 +1,536 @@
+import streamlit as st
+import io
+import os
+
+from clearsight import config
+from clearsight.api import ensure_api_server
+from clearsight.metrics import count, timed
+from clearsight.models import get_registry
+from clearsight.profiling import profile_rerun
+
+# Add this right after imports but before st.set_page_config
+def nav_page(page_name, timeout_secs=3):
+    nav_script = """
+        <script type="text/javascript">
+            function attempt_navigation(page_name) {
+                var links = window.parent.document.getElementsByTagName('a');
+                for (var i = 0; i < links.length; i++) {
+                    if (links[i].href.toLowerCase().includes(page_name.toLowerCase())) {
+                        links[i].click();
+                        return;
+                    }
+                }
+                setTimeout(function() { attempt_navigation(page_name); }, 100);
+            }
+            window.addEventListener("load", function() {
+                attempt_navigation("%s");
+            });
+        </script>
+    """ % page_name
+    st.components.v1.html(nav_script, height=0, width=0)
+
+st.set_page_config(page_title="Take Test - ClearSight.AI", 
+                   page_icon="👁️", 
+                   layout="wide",
+                   initial_sidebar_state="collapsed")
+
+
+
+
+take_test_html = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Particles.js Animation</title>
+  <style>
+  body {
+    margin: 0;
+    padding: 0;
+    overflow: hidden;
+  }
+  #particles-js {
+    position: fixed;
+    width: 100vw;
+    height: 100vh;
+    top: 0;
+    left: 0;
+    z-index: -1;
+  }
+  .content {
+    position: relative;
+    z-index: 1;
+    text-align: center;
+    padding-top: 5vh;
+    color: white;
+    font-family: Arial, sans-serif;
+  }
+
+  .test-container {
+    position: absolute;
+    top: 50%;
+    left: 50%;
+    transform: translate(-50%, -50%);
+    width: 45%;
+    max-width: 50rv;
+    margin: 0 auto;
+    background: rgba(15, 17, 23, 0.15);
+    padding: 1rem;
+    border-radius: 20px;
+    backdrop-filter: blur(5px);
+    font-family: Arial, sans-serif;
+    text-align: center;
+    box-sizing: border-box;
+  }
+  .gradient-text {
+    font-size: clamp(2.5rem, 8vw, 4.5rem);
+    font-weight: 700;
+    background: linear-gradient(45deg, #eff6ee, #9197ae, #273043);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    text-shadow: 0 4px 10px rgba(0,0,0,0.2);
+    line-height: 1;
+    margin: 0;
+    padding: 0.5rem 0;
+  }
+  @media (max-width: 768px) {
+    .test-container {
+      width: 85%;
+      padding: 0.8rem;
+    }
+    .gradient-text {
+      font-size: clamp(2rem, 10vw, 3rem);
+    }
+  }
+  @media (max-width: 480px) {
+    .test-container {
+      width: 95%;
+    }
+    .gradient-text {
+      font-size: clamp(1.8rem, 12vw, 2.5rem);
+    }
+  }
+  </style>
+</head>
+<body>
+  <div id="particles-js"></div>
+    <div class="test-container"> <h2 class="gradient-text">ClearSight.AI</h2>
+    <!-- Streamlit content will be injected here -->
+    </div>
+  <script src="https://cdn.jsdelivr.net/particles.js/2.0.0/particles.min.js"></script>
+  <script>
+    particlesJS("particles-js", {
+      "particles": {
+        "number": {
+          "value": 400,
+          "density": {
+            "enable": true,
+            "value_area": 800
+          }
+        },
+        "color": {
+          "value": "#ffffff"
+        },
+        "shape": {
+          "type": "star",
+          "stroke": {
+            "width": 0,
+            "color": "#000000"
+          },
+          "polygon": {
+            "nb_sides": 5
+          },
+          "image": {
+            "src": "img/github.svg",
+            "width": 100,
+            "height": 100
+          }
+        },
+        "opacity": {
+          "value": 0.5,
+          "random": false,
+          "anim": {
+            "enable": true,
+            "speed": 1,
+            "opacity_min": 0.5,
+            "sync": false
+          }
+        },
+        "size": {
+          "value": 2,
+          "random": true,
+          "anim": {
+            "enable": false,
+            "speed": 40,
+            "size_min": 0.1,
+            "sync": false
+          }
+        },
+        "line_linked": {
+          "enable": true,
+          "distance": 100,
+          "color": "#ffffff",
+          "opacity": 0.22,
+          "width": 1
+        },
+        "move": {
+          "enable": true,
+          "speed": 0.65,
+          "direction": "none",
+          "random": false,
+          "straight": false,
+          "out_mode": "bounce",
+          "bounce": true,
+          "attract": {
+            "enable": false,
+            "rotateX": 600,
+            "rotateY": 1200
+          }
+        }
+      },
+      "interactivity": {
+        "detect_on": "canvas",
+        "events": {
+          "onhover": {
+            "enable": true,
+            "mode": "grab"
+          },
+          "onclick": {
+            "enable": true,
+            "mode": "repulse"
+          },
+          "resize": true
+        },
+        "modes": {
+          "grab": {
+            "distance": 100,
+            "line_linked": {
+              "opacity": 1
+            }
+          },
+          "bubble": {
+            "distance": 400,
+            "size": 10,
+            "duration": 2,
+            "opacity": 0.5,
+            "speed": 1
+          },
+          "repulse": {
+            "distance": 200,
+            "duration": 0.4
+          },
+          "push": {
+            "particles_nb": 2
+          },
+          "remove": {
+            "particles_nb": 3
+          }
+        }
+      },
+      "retina_detect": true
+    });
+  </script>
+</body>
+</html>
+"""
+
+# Custom CSS for Streamlit components
+st.markdown("""
+<style>
+.stApp {
+    background: transparent !important;
+}
+
+.st-emotion-cache-1y4p8pa {
+    padding: 0 !important;
+}
+
+.stMarkdown, .stFileUploader, .stImage {
+    position: relative;
+    z-index: 2 !important;
+}
+
+h1, h2, h3, h4, h5, h6, p, label {
+    color: white !important;
+}
+
+.st-bb {
+    border-color: white !important;
+}
+
+.st-cb {
+    color: white !important;
+}
+
+.severity-box {
+    padding: 20px;
+    border-radius: 10px;
+    margin: 10px 0;
+    background: rgba(255,255,255,0.1);
+}
+
+.progress-container {
+    margin: 20px 0;
+    padding: 10px;
+    border-radius: 8px;
+    background: rgba(255,255,255,0.1);
+}
+</style>
+""", unsafe_allow_html=True)
+
+ensure_api_server()
+
+#session state initializations
+if 'show_retry' not in st.session_state:
+    st.session_state.show_retry = False
+if 'show_analysis' not in st.session_state:
+    st.session_state.show_analysis = False
+if 'diagnosis_data' not in st.session_state:
+    st.session_state.diagnosis_data = None
+if 'batch_results' not in st.session_state:
+    st.session_state.batch_results = None
+
+
+st.components.v1.html(take_test_html, height=400)
+
+def clear_batch_results():
+    """Results belong to the files they were screened from, so a new upload discards them"""
+    st.session_state.batch_results = None
+
+
+def run_batch_screening():
+    """Screen many uploaded images in batches, streaming rows into a results table.
+
+    The rows are kept in ``st.session_state.batch_results`` so the table and the
+    download button survive later reruns, such as the one the download click triggers.
+    """
+    import pandas as pd
+
+    uploaded_files = st.file_uploader(
+        "Upload retinal scan images",
+        type=["jpg", "jpeg", "png"],
+        accept_multiple_files=True,
+        key="batch_uploader",
+        on_change=clear_batch_results,
+    )
+    if not uploaded_files:
+        return
+    if st.button("Screen images", key="batch_screen_button"):
+        st.session_state.batch_results = screen_batch(uploaded_files)
+
+    rows = st.session_state.batch_results
+    if rows is None:
+        return
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    st.download_button("Download results (CSV)", pd.DataFrame(rows).to_csv(index=False),
+                       file_name="screening_results.csv", mime="text/csv")
+
+
+def screen_batch(uploaded_files):
+    """Return one result row per uploaded file, showing progress while the batches run"""
+    import pandas as pd
+    from clearsight.pipeline import batched
+    from clearsight.preprocessing import decode
+
+    with st.spinner('Loading models...'):
+        registry = get_registry().load()
+
+    rows = []
+    table = st.empty()
+    progress = st.progress(0.0)
+    for files in batched(uploaded_files):
+        names, images = [], []
+        for f in files:
+            try:
+                with timed("decode"):
+                    images.append(decode(f))
+                names.append(f.name)
+            except Exception as e:
+                rows.append({"File": f.name, "Status": f"Unreadable image: {e}"})
+
+        if images:
+            for name, result in zip(names, registry.screen(images)):
+                count("screening", "rejected" if result['stage'] is None else "accepted")
+                if result['stage'] is None:
+                    rows.append({"File": name, "Status": "Non-retinal image",
+                                 "Retina Probability (%)": round(result['retina_prob'] * 100, 1)})
+                else:
+                    rows.append({"File": name, "Status": "Screened",
+                                 "Retina Probability (%)": round(result['retina_prob'] * 100, 1),
+                                 "Stage": result['stage'],
+                                 "Diagnosis": config.DR_STAGE_NAMES[result['stage']],
+                                 "Confidence (%)": round(result['confidence'] * 100, 1)})
+
+        table.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        progress.progress(min(len(rows) / len(uploaded_files), 1.0))
+
+    table.empty()
+    progress.empty()
+    return rows
+
+
+with profile_rerun("take_test", st.query_params), st.container():
+    st.title("Test Your Diabetic Retinopathy Status")
+    st.markdown("---")
+
+    screening_mode = st.radio("Screening mode", ["Single image", "Batch screening"], horizontal=True)
+
+    if screening_mode == "Batch screening":
+        run_batch_screening()
+    else:
+        st.markdown("#### Or select a sample retinal image for testing:")
+        sample_choice = st.selectbox("Choose a DR stage (0 = No DR, 1 = Mild DR, 2 = Moderate DR, 3 = Severe, 4 = Proliferative)", 
+                                     options=["None", "0", "1", "2", "3", "4"], 
+                                     index=0)
+
+        image = None
+        image_bytes = None
+
+        if sample_choice != "None":
+            sample_path = os.path.join(config.SAMPLE_IMAGES_DIR, f"{sample_choice}.png")
+            try:
+                from clearsight.preprocessing import decode
+                with open(sample_path, "rb") as f:
+                    image_bytes = f.read()
+                with timed("decode"):
+                    image = decode(io.BytesIO(image_bytes))
+                st.success(f"Loaded sample image for stage {sample_choice}")
+            except Exception as e:
+                st.error(f"Failed to load sample image: {e}")
+                st.stop()
+        else:
+            uploaded_file = st.file_uploader(
+                "Upload a retinal scan image", 
+                type=["jpg", "jpeg", "png"], 
+                accept_multiple_files=False, 
+                key="test_uploader"
+            )
+            if uploaded_file:
+                from clearsight.preprocessing import decode
+                image_bytes = uploaded_file.getvalue()
+                with timed("decode"):
+                    image = decode(io.BytesIO(image_bytes))
+
+        if image is not None:
+            try:
+                col1, col2, col3 = st.columns([5, 5, 6.5])
+                with col2:
+                    st.markdown("""
+                    <style>
+                        .centered-image {
+                            display: flex;
+                            justify-content: center;
+                            margin: 0 auto;
+                            padding: 20px 0;
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)             
+
+                    st.markdown('<div class="centered-image">', unsafe_allow_html=True)
+                    with timed("render"):
+                        st.image(image, caption="Selected Retinal Scan", width=600)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+                # Models are shared by all sessions; only the first request pays for loading
+                with st.spinner('Loading models...'):
+                    registry = get_registry().load()
+
+                # Retina validation, then DR staging for valid scans; repeat scans come from the cache
+                with st.spinner('Analyzing retinal scan...'):
+                    result = registry.screen([image])[0]
+                    retina_prob = result['retina_prob']
+
+                if retina_prob < config.RETINA_THRESHOLD:
+                    count("screening", "rejected")
+                    st.session_state.show_retry = True
+                    st.error("❌ Non-retinal Image Detected. Please upload a valid retinal scan.")
+                
+                    if st.button("🔄 Try Again", key="retry_button"):
+                        st.session_state.pop("show_retry", None)
+                        st.session_state.pop("test_uploader", None)
+                        st.rerun()
+                else:
+                    count("screening", "accepted")
+                    st.session_state.show_retry = False
+                    st.success(f"✅ Valid Retinal Scan Detected (Confidence: {retina_prob*100:.1f}%)")
+
+                    dr_class = result['stage']
+                    confidence = result['confidence']
+
+                    # Save to session; the original file bytes, so Results and Annotation see full resolution
+
+                    # Lesion masks and metrics are computed once here and reused by Results, the reports
+                    # and (through the shared view cache) the Annotation page
+                    with st.spinner('Measuring lesions...'):
+                        from clearsight.annotation import get_view
+                        lesions = get_view(image_bytes).metrics
+
+                    st.session_state.diagnosis_data = {
+                        'stage': dr_class,
+                        'confidence': confidence,
+                        'retina_prob': retina_prob,
+                        'image': image_bytes,
+                        'lesions': lesions
+                    }
+                    # Display Results
+                    dr_stages = {
+                        0: ["No Diabetic Retinopathy (Stage 0)", "#4CAF50", "✅"],
+                        1: ["Mild Diabetic Retinopathy (Stage 1)", "#FFC107", "⚠️"],
+                        2: ["Moderate Diabetic Retinopathy (Stage 2)", "#FF9800", "⚠️⚠️"],
+                        3: ["Severe Diabetic Retinopathy (Stage 3)", "#F44336", "❌"],
+                        4: ["Proliferative Diabetic Retinopathy (Stage 4)", "#D32F2F", "🆘"]
+                    }
+
+                    stage, color, emoji = dr_stages[dr_class]
+
+                    st.markdown(f"""
+                    <div class="severity-box" style="border-left: 5px solid {color}; padding-left: 15px; margin-top: 20px;">
+                        <h3>{emoji} Diagnosis: {stage}</h3>
+                        <p><strong>Confidence:</strong> {confidence*100:.1f}%</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    # Button Style
+                    st.markdown("""
+                    <style>
+                        .full-width-button-container {
+                            width: 100% !important;
+                            text-align: center !important;
+                            margin-top: 20px !important;
+                        }
+                        .stButton>button {
+                            width: 100% !important;
+                            padding: 15px !important;
+                            font-size: 18px !important;
+                            font-weight: bold !important;
+                            border-radius: 8px !important;
+                            background-color: #ff4b4b !important;
+                            border: 2px solid #cc0000 !important;
+                            color: white !important;
+                            transition: all 0.3s ease-in-out !important;
+                        }
+                        .stButton>button:hover {
+                            background-color: #cc0000 !important;
+                            transform: scale(1.03) !important;
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)
+
+                    st.markdown("---")
+
+                    if st.button("Results Analysis"):
+                        nav_page("results_analysis") 
+
+                    st.markdown("---")
+
+            except Exception as e:
+                st.error(f"Error processing image: {str(e)}")
+
+st.markdown("---")
+st.markdown("""
+<div style="text-align: center; color: #666; padding: 2rem 0;">
+    <p>ClearSight.AI Diagnostic Report • Not medical advice</p>
+    <p>© 2024 ClearSight Analytics</p>
+</div>
+""", unsafe_allow_html=True)
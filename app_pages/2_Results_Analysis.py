@@ -0,0 +1,749 @@
+import streamlit as st
+import os
+from dotenv import load_dotenv
+from pathlib import Path
+
+from clearsight.metrics import count, timed
+from clearsight.profiling import profile_rerun
+from clearsight.report import build_email, deliver, generate_html_report
+
+
+load_dotenv()
+
+EMAIL_ADDRESS = st.secrets["email"]["RESULTS_EMAIL"]
+EMAIL_PASSWORD = st.secrets["email"]["RESULTS_EMAIL_PWD"]
+SMTP_SERVER = 'smtp.gmail.com'
+SMTP_PORT = 587
+
+def nav_page(page_name, timeout_secs=1):
+    nav_script = """
+        <script type="text/javascript">
+            function attempt_navigation(page_name) {
+                var links = window.parent.document.getElementsByTagName('a');
+                for (var i = 0; i < links.length; i++) {
+                    if (links[i].href.toLowerCase().includes(page_name.toLowerCase())) {
+                        links[i].click();
+                        return;
+                    }
+                }
+                setTimeout(function() { attempt_navigation(page_name); }, 100);
+            }
+            window.addEventListener("load", function() {
+                attempt_navigation("%s");
+            });
+        </script>
+    """ % page_name
+    # html(nav_script, height=0, width=0)
+    st.components.v1.html(nav_script, height=0, width=0)
+def send_email(receiver_email, patient_name, diagnosis_data, stage_info, pathologies):
+    """Send professional medical report email"""
+    with timed("email_build"):
+        msg = build_email(EMAIL_ADDRESS, receiver_email, patient_name, diagnosis_data, stage_info, pathologies)
+    try:
+        with timed("email_send"):
+            deliver(msg, SMTP_SERVER, SMTP_PORT, EMAIL_ADDRESS, EMAIL_PASSWORD)
+        count("email", "sent")
+        return True
+    except Exception as e:
+        count("email", "failed")
+        st.error(f"Email Error: {str(e)}")
+        return False
+
+# Page Configuration
+st.set_page_config(
+    page_title="Results Analysis - ClearSight.AI",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="collapsed"
+)
+
+# Opt-in profiling of this rerun; stopped however the run ends, including st.rerun and st.stop
+with profile_rerun("results_analysis", st.query_params):
+
+    # Custom CSS with Streamlit-native dark theme integration
+    st.markdown("""
+<style>
+    /* Main container styling */
+    .stApp {
+        background-color: #0E1117;  /* Streamlit's default dark bg */
+    }
+
+    /* Severity box styling */
+    .severity-box {
+        padding: 2rem;
+        margin: 2rem 0;
+        background: #1A1D24;
+        border-radius: 12px;
+        border-left: 5px solid;
+        transition: all 0.3s ease;
+    }
+
+    /* Metric card styling */
+    .metric-card {
+        padding: 1.5rem;
+        background: #262A33;
+        border-radius: 8px;
+        margin: 1rem 0;
+    }
+
+    /* Clinical metric styling */
+    .clinical-metric {
+        padding: 1rem;
+        background: #1E222A;
+        border-radius: 6px;
+        margin: 0.75rem 0;
+    }
+
+    /* Recommendation card styling */
+    .recommendation-card {
+        padding: 1rem;
+        background: #2D3139;
+        border-left: 4px solid;
+        border-radius: 6px;
+        margin: 1rem 0;
+    }
+
+    /* Text styling */
+    h1, h2, h3, h4, h5, h6 {
+        color: #FAFAFA !important;
+    }
+    
+    /* Progress bar styling */
+    .stProgress > div > div > div {
+        background-color: #20BEFF !important;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+
+    st.markdown("""
+<div style="text-align: center; width: 100%;">
+    <h1 style="
+        display: inline-block;
+        font-size: 2.8rem;
+        color: #7DD3FC;
+        text-transform: uppercase;
+        letter-spacing: 2px;
+        margin: 0 auto 2rem;
+        padding-bottom: 1rem;
+        position: relative;
+        background: linear-gradient(90deg, #7DD3FC 0%, #818CF8 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+    ">
+        Detailed Diagnostic Report
+        <div style="
+            position: absolute;
+            bottom: 0;
+            left: 47%;
+            right: 50%;
+            transform: translateX(-50%);
+            width: 70%;
+            height: 3px;
+            background: linear-gradient(90deg, #7DD3FC 0%, #818CF8 100%);
+            border-radius: 2px;
+        "></div>
+    </h1>
+</div>
+""", unsafe_allow_html=True)
+
+    st.markdown("""
+<style>
+    @media (max-width: 768px) {
+        h1 {
+            font-size: 2rem !important;
+            letter-spacing: 1px !important;
+        }
+        h1 div {
+            width: 90% !important;
+        }
+    }
+</style>
+""", unsafe_allow_html=True)
+
+    if 'diagnosis_data' in st.session_state and st.session_state.diagnosis_data:
+        # Charting and imaging libraries are only needed once there is a diagnosis to show
+        import numpy as np
+        import pandas as pd
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from PIL import ImageColor
+
+        data = st.session_state.diagnosis_data
+        dr_stages = {
+            0: ["No Diabetic Retinopathy", "#4CAF50", "✅", "No abnormalities detected"],
+            1: ["Mild DR", "#FFC107", "⚠️", "Microaneurysms present"],
+            2: ["Moderate DR", "#FF9800", "⚠️⚠️", "Multiple hemorrhages"], 
+            3: ["Severe DR", "#F44336", "❌", "Retinal lesions"],
+            4: ["Proliferative DR", "#D32F2F", "🆘", "Neovascularization"]
+        }
+    
+        stage_info = dr_stages[data['stage']]
+    
+        # Header Section with spacing
+        col1, col2, col3= st.columns([3, 1, 3])  # Adjusted column ratio for spacing
+        with col1:
+
+            st.markdown(f"""
+                    <h2 style="
+                        color: #F8FAFC;
+                        padding: 0.5rem 1rem;
+                        margin: 2rem 0 1rem 0;
+                        border-left: 4px solid {stage_info[1]};
+                        background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 75%);
+                        border-radius: 10px;
+                        display: flex;
+                        align-items: center;
+                        gap: 1rem;
+                    ">
+                            Retinal Scan Analysis
+                    </h2>
+                    """, unsafe_allow_html=True)
+        
+            st.markdown("""
+                    <style>
+                        h2 {
+                            transition: transform 0.2s ease, box-shadow 0.2s ease !important;
+                        }
+                        
+                        h2:hover {
+                            transform: translateX(15px);
+                            box-shadow: 1px 1px 1px rgba(0, 0, 0, 0.2);
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)
+
+            # Display-size rendition, encoded once per image and reused on every rerun
+            from clearsight.renditions import data_uri
+            img_src = data_uri(data['image'])
+
+
+            st.markdown(f"""
+        <div style="
+            border: 3px solid {stage_info[1]};
+            border-radius: 12px;
+            padding: 10px;
+            margin: 1rem 0;
+            box-shadow: 0 4px 20px {stage_info[1]}40;
+            background: #1A1D24;
+            display: inline-block;
+        ">
+            <img src="{img_src}" 
+                style="
+                    width: 100%;
+                    max-width: 590px;
+                    border-radius: 8px;
+                    display: block;
+                    margin: 0 auto;
+                ">
+            <p style="
+                text-align: center;
+                color: #94A3B8;
+                margin: 1rem 0 0 0;
+                font-size: 0.95rem;
+                font-weight: 500;
+            ">
+                Original Fundus Image
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        
+        with col3:
+            st.markdown(f"""
+                    <h2 style="
+                        color: #F8FAFC;
+                        padding: 0.5rem 1rem;
+                        margin: 2rem 0 1rem 0;
+                        border-left: 4px solid {stage_info[1]};
+                        background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 75%);
+                        border-radius: 10px;
+                        display: flex;
+                        align-items: center;
+                        gap: 1rem;
+                    ">
+                        Diagnostic Summary
+                    </h2>
+                    """, unsafe_allow_html=True)
+            st.markdown("""
+                    <style>
+                        h2 {
+                            transition: transform 0.2s ease, box-shadow 0.2s ease !important;
+                        }
+                        
+                        h2:hover {
+                            transform: translateX(15px);
+                            box-shadow: 4px 4px 15px rgba(0, 0, 0, 0.2);
+                        }
+                    </style>
+                    """, unsafe_allow_html=True)
+        
+
+
+
+            st.markdown(f"""
+        <style>
+            @media (max-width: 768px) {{
+                .severity-box {{
+                    min-height: auto !important;
+                    padding: 1.5rem !important;
+                }}
+                .severity-title {{
+                    font-size: clamp(1.5rem, 6vw, 2rem) !important;
+                }}
+                .severity-description {{
+                    font-size: clamp(1rem, 3.5vw, 1.1rem) !important;
+                }}
+                .metric-card h2 {{
+                    font-size: clamp(1.75rem, 8vw, 2.25rem) !important;
+                }}
+                .metric-card h4 {{
+                    font-size: clamp(0.9rem, 3vw, 1rem) !important;
+                }}
+            }}
+        </style>
+
+        <div class="severity-box" style="border-color: {stage_info[1]}; margin-top: 1.5rem; 
+                background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 75%); 
+                min-height: 500px;">
+            <div style="display: flex; align-items: center; margin-bottom: 1.5rem;">
+                <span style="font-size: clamp(2rem, 8vw, 2.5rem); margin-right: 1rem; color: {stage_info[1]};">{stage_info[2]}</span>
+                <div>
+                    <h2 class="severity-title" style="margin: 0; color: {stage_info[1]}; 
+                        font-size: clamp(1.8rem, 6vw, 2.5rem);">
+                        {stage_info[0]}
+                    </h2>
+                    <p class="severity-description" style="color: #CCCCCC; margin: 0.2rem 0;
+                        font-size: clamp(1rem, 3vw, 1.2rem);">
+                        {stage_info[3]}
+                    </p>
+                </div>
+            </div>
+            <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1.5rem;">
+                <div class="metric-card" style="background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 100%);">
+                    <h4 style="margin: 0 0 0.5rem 0; color: #CCCCCC; font-size: clamp(1rem, 3vw, 1.1rem);">
+                        Diagnosis Confidence
+                    </h4>
+                    <h2 style="margin: 0; color: {stage_info[1]}; font-size: clamp(1.8rem, 6vw, 2.25rem);">
+                        {data['confidence']*100:.1f}%
+                    </h2>
+                </div>
+                <div class="metric-card" style="background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 100%);">
+                    <h4 style="margin: 0 0 0.5rem 0; color: #CCCCCC; font-size: clamp(1rem, 3vw, 1.1rem);">
+                        Image Quality Score
+                    </h4>
+                    <h2 style="margin: 0; color: {stage_info[1]}; font-size: clamp(1.8rem, 6vw, 2.25rem);">
+                        {data['retina_prob']*100:.1f}%
+                    </h2>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        # Detailed Metrics
+        st.markdown("---")
+        st.header("Pathological Features Analysis")
+    
+        # Measured once when the diagnosis was made; diagnoses from before lesion metrics existed are measured now
+        from clearsight.annotation import LESION_LABELS, get_view
+        if not data.get('lesions'):
+            with st.spinner('Measuring lesions...'):
+                data['lesions'] = get_view(data['image']).metrics
+        pathologies = {LESION_LABELS[lesion]: metrics for lesion, metrics in data['lesions'].items()}
+
+        # Create DataFrame for visualization
+        df = pd.DataFrame({
+            'Pathology': list(pathologies.keys()),
+            'Lesions': [m['count'] for m in pathologies.values()],
+            'Area': [round(m['area_fraction'] * 100, 2) for m in pathologies.values()],
+            'Color': [stage_info[1]] * len(pathologies)  # Use severity color
+        })
+
+        fig_radar = go.Figure()
+
+        fig_radar.add_trace(go.Scatterpolar(
+            r=df['Area'],
+            theta=df['Pathology'],
+            fill='toself',
+            name='Affected Area (%)',
+            line=dict(color=stage_info[1]),
+            fillcolor=f'rgba{(*ImageColor.getcolor(stage_info[1], "RGB"), 0.2)}'
+        ))
+
+        fig_radar.update_layout(
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    rangemode='tozero',
+                    tickfont=dict(color='#FFFFFF'),
+                    gridcolor='rgba(255,255,255,0.2)'
+                ),
+                bgcolor='rgba(0,0,0,0)'
+            ),
+            showlegend=False,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            height=400,
+            margin=dict(l=50, r=50, b=50, t=50))
+
+
+        # Create bar chart with custom styling
+        fig_bars = px.bar(
+            df,
+            x='Lesions',
+            y='Pathology',
+            orientation='h',
+            color='Color',
+            color_discrete_map="identity",
+            text='Lesions',
+            labels={'Lesions': 'Detected Lesions'},
+        )
+
+        fig_bars.update_traces(
+            texttemplate='%{text}',
+            textposition='outside',
+            marker_line_width=0,
+            textfont=dict(color='white')
+        )
+
+        fig_bars.update_layout(
+            xaxis=dict(showgrid=False, visible=False),
+            yaxis=dict(title='', tickfont=dict(color='white')),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            bargap=0.4,
+            height=400,
+            margin=dict(l=50, r=50, b=50, t=50),
+            hoverlabel=dict(
+                bgcolor=stage_info[1],
+                font_size=16,
+                font_color="white"
+            )
+        )
+
+        # Create columns for visualizations
+        col1, col2 = st.columns([1, 1])
+    
+        with col1:
+            st.plotly_chart(fig_radar, use_container_width=True)
+            st.markdown("""
+            <div style="color: #94A3B8; font-size: 0.9rem; text-align: center;">
+                Share of the retinal image covered by each pathological feature (%)
+            </div>
+        """, unsafe_allow_html=True)
+    
+        with col2:
+            st.plotly_chart(fig_bars, use_container_width=True)
+            st.markdown("""
+            <div style="color: #94A3B8; font-size: 0.9rem; text-align: center;">
+                Number of separate lesions detected for each pathological feature
+            </div>
+        """, unsafe_allow_html=True)
+
+        # Add statistical summary
+        most_extensive = df.loc[df['Area'].idxmax(), 'Pathology'] if df['Area'].max() > 0 else "None"
+        densest = max(pathologies.values(), key=lambda m: m['density_per_mpx'])
+        summary = [
+            (f"{df['Lesions'].sum()}", "Total Lesions"),
+            (f"{df['Area'].sum():.2f}%", "Affected Area"),
+            (most_extensive, "Most Extensive"),
+            (f"{densest['density_per_mpx']:.1f}", "Peak Lesions / Megapixel"),
+        ]
+        summary_cells = "".join(f"""
+                <div>
+                    <div style="color: {stage_info[1]}; font-size: 1.5rem; font-weight: bold;">
+                        {value}
+                    </div>
+                    <div style="color: #94A3B8; font-size: 0.9rem;">{label}</div>
+                </div>""" for value, label in summary)
+        st.markdown(f"""
+        <div class="clinical-metric" style="margin-top: 2rem;">
+            <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; text-align: center;">
+                {summary_cells}
+            </div>
+        </div>
+    """, unsafe_allow_html=True)
+
+        # Historical Progression Analysis
+        st.markdown("---")
+        st.header("Historical Progression Analysis")
+    
+        class ProgressionTracker:
+            def generate_mock_history(self, current_stage, current_confidence, years=3):
+                """Generate history ending with current diagnosis stage"""
+                num_points = years * 2  # Every 6 months
+            
+                # Create base progression with logical trends
+                stages = np.linspace(max(0, current_stage - 1.5), current_stage, num_points)
+            
+                # Add realistic fluctuations
+                noise = np.random.normal(0, 0.2, num_points)
+                stages = np.clip(stages + noise, 0, 4)
+            
+                # Ensure final value matches exactly
+                stages[-1] = current_stage
+            
+                # Generate dates
+                dates = pd.date_range(end=pd.Timestamp.now(), periods=num_points, freq='6ME')
+            
+                # Confidence values with final value matching current diagnosis
+                confidences = np.random.uniform(0.7, 0.95, num_points)
+                confidences[-1] = current_confidence
+            
+                return pd.DataFrame({
+                    'date': dates,
+                    'stage': stages,
+                    'confidence': confidences
+                }).set_index('date')
+
+            def plot_progression(self, history, current_stage, color="#FFFFFF"):
+                """Create progression plot with current stage emphasis"""
+                fig = px.line(history, y='stage', 
+                            markers=True, 
+                            labels={'stage': 'DR Stage', 'date': 'Date'},
+                            color_discrete_sequence=[color])
+            
+                # Highlight current diagnosis
+                last_date = history.index[-1]
+                fig.add_annotation(
+                    x=last_date,
+                    y=current_stage,
+                    text=f"Current Diagnosis: Stage {current_stage}",
+                    showarrow=True,
+                    arrowhead=3,
+                    bgcolor=color,
+                    font=dict(color="white")
+                )
+            
+                fig.update_layout(
+                    template='plotly_dark',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    yaxis_range=[0,4.2],
+                    xaxis_title="Date",
+                    yaxis_title="DR Stage",
+                    height=400,
+                    margin=dict(l=50, r=50, b=50, t=50)
+                )
+                fig.update_traces(
+                    line_width=3,
+                    marker_size=10,
+                    marker_color=color,
+                    line_color=color
+                )
+                return fig
+
+        # Usage in your Streamlit code
+        pt = ProgressionTracker()
+        history = pt.generate_mock_history(
+            current_stage=data['stage'],
+            current_confidence=data['confidence']
+        )
+        fig_progression = pt.plot_progression(history, data['stage'], color=stage_info[1])
+        st.plotly_chart(fig_progression, use_container_width=True) 
+
+        with st.form("email_form"):
+            st.markdown(f"""
+            <h2 style="
+                color: #F8FAFC;
+                padding: 0.5rem 1rem;
+                margin: 2rem 0 1rem 0;
+                border-left: 4px solid {stage_info[1]};
+                background: linear-gradient(270deg, #1E293B 0%, {stage_info[1]}20 75%);
+                border-radius: 10px;
+                display: flex;
+                align-items: center;
+                gap: 1rem;
+            ">
+                Share Analysis Report
+            </h2>
+        """, unsafe_allow_html=True)
+
+            col1, col2 = st.columns([1, 1])
+            with col1:
+                email = st.text_input(
+                    "Recipient Email",
+                    placeholder="example@domain.com",
+                    help="Enter the recipient's email address"
+                )
+        
+            with col2:
+                name = st.text_input(
+                    "Patient Name",
+                    placeholder="John Doe",
+                    help="Enter the patient's full name"
+                )
+        
+            submit_btn = st.form_submit_button(
+                "🚀 Send Comprehensive Report",
+                use_container_width=True,
+                help="Send the full diagnostic report via email"
+            )
+            centered_styles = """
+        <style>
+            /* Center align all status messages */
+            .stAlert {
+                margin: 0 auto !important;
+                max-width: fit-content !important;
+            }
+            
+            /* Center spinner container */
+            [data-testid="stSpinner"] {
+                justify-content: center !important;
+            }
+            
+            /* Center spinner text */
+            .stSpinner > div {
+                text-align: center !important;
+                width: 100% !important;
+            }
+            
+            /* Specific centering for column content */
+            .st-emotion-cache-1vbkxwb {
+                display: flex !important;
+                flex-direction: column !important;
+                align-items: center !important;
+            }
+        </style>
+        """
+
+            # Place this at the top of your main function
+            st.markdown(centered_styles, unsafe_allow_html=True)
+
+            # Then in your column section
+            col1, col2, col3 = st.columns([1,2,1])
+            with col2:
+                if submit_btn:
+                    if not email or not name:
+                        st.error("❌ Please complete all required fields")
+                    else:
+                        with st.spinner("📨 Sending report..."):
+                            try:
+                                with timed("html_report"):
+                                    generate_html_report(data, stage_info, fig_radar, fig_bars, fig_progression)
+                                if send_email(email, name, data, stage_info, pathologies):
+                                    st.success("✅ Report successfully sent!")
+                                    st.snow()
+                                else:
+                                    st.error("⚠️ Failed to send email - please try again")
+                            except Exception as e:
+                                st.error(f"🚨 Error: {str(e)}")
+
+        st.markdown(f"""
+        <style>
+            /* Input field styling */
+            .stTextInput input {{
+                background-color: #1E293B !important;
+                border: 1px solid #334155 !important;
+                color: #F8FAFC !important;
+                border-radius: 8px !important;
+                padding: 0.75rem 1rem !important;
+            }}
+            
+            /* Hover effects */
+            .stTextInput input:hover {{
+                border-color: {stage_info[1]} !important;
+                box-shadow: 0 0 0 1px {stage_info[1]} !important;
+            }}
+            
+            /* Submit button styling */
+            .stButton button {{
+                background: linear-gradient(270deg, {stage_info[1]} 0%, {stage_info[1]}80 100%);
+                border: none;
+                color: white;
+                font-weight: 600;
+                transition: all 0.3s ease;
+                border-radius: 8px;
+                padding: 0.75rem 2rem;
+            }}
+            
+            .stButton button:hover {{
+                transform: translateY(-1px);
+                box-shadow: 0 4px 15px {stage_info[1]}40;
+            }}
+        </style>
+    """, unsafe_allow_html=True)
+
+            # Footer Navigation
+        # st.markdown("---")
+        col1, col2, col3 = st.columns([1,2,1])
+        with col2:
+            if st.button("Perform New Analysis", use_container_width=True):
+                st.session_state.pop('diagnosis_data')
+                st.rerun()
+
+    
+    else:
+        st.markdown("""
+    <div style="text-align: center; margin: 4rem 0 2rem 0;">
+        <div style="
+            padding: 2rem;
+            background: #1A1D24;
+            border-radius: 12px;
+            margin: 0 auto;
+            max-width: 600px;
+        ">
+            <div style="font-size: 4rem; margin-bottom: 1rem;">🔍</div>
+            <h2 style="color: #F8FAFC; margin-bottom: 1rem;">No Analysis Found</h2>
+            <p style="color: #94A3B8; margin-bottom: 2rem;">Please complete a retinal scan analysis to view results</p>
+            <a href="/Take_Test" target="_self">
+                <button style="
+                    padding: 1rem 3rem;
+                    background: #59596e;
+                    color: #e0e0e6;
+                    border: none;
+                    border-radius: 8px;
+                    font-size: 1.1rem;
+                    font-weight: 600;
+                    transition: all 0.3s ease;
+                    cursor: pointer;
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 0.5rem;
+                ">
+                    <span>Start New Analysis</span>
+                    <span style="font-size: 1.2rem;">→</span>
+                </button>
+            </a>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Footer
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown("""
+                <style>
+                    .full-width-button-container {
+                        width: 100% !important;
+                        text-align: center !important;
+                        margin-top: 20px !important;
+                    }
+                    .stButton>button {
+                        width: 100% !important;
+                        padding: 15px !important;
+                        font-size: 18px !important;
+                        font-weight: bold !important;
+                        border-radius: 8px !important;
+                        background-color: #ff4b4b !important;
+                        border: 2px solid #cc0000 !important;
+                        color: white !important;
+                        transition: all 0.3s ease-in-out !important;
+                    }
+                    .stButton>button:hover {
+                        background-color: #cc0000 !important;
+                        transform: scale(1.03) !important;
+                    }
+                </style>
+                """, unsafe_allow_html=True)
+
+        if st.button("RetinaVision Analyzer"):
+            nav_page("annotation")
+    st.markdown("""
+<div style="text-align: center; color: #666; padding: 2rem 0;">
+    <p>ClearSight.AI Diagnostic Report • Not medical advice</p>
+    <p>© 2024 ClearSight Analytics</p>
+</div>
+""", unsafe_allow_html=True)
@@ -1,9 +1,9 @@
 import streamlit as st
-import cv2
-import numpy as np
-import tempfile
 import os
 
+from clearsight.metrics import timed
+from clearsight.profiling import profile_rerun
+
 
 def nav_page(page_name, timeout_secs=1):
     nav_script = """
@@ -25,60 +25,52 @@ def nav_page(page_name, timeout_secs=1):
     """ % page_name
     # html(nav_script, height=0, width=0)
     st.components.v1.html(nav_script, height=0, width=0)
-def create_annotation_masks(image_path):
-    # Load the fundus image
-    img = cv2.imread(image_path)
-    if img is None:
-        raise ValueError(f"Image not found at path: {image_path}")
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
-    lab = cv2.cvtColor(img, cv2.COLOR_RGB2LAB)
-
-    # Initialize empty masks for each lesion type
-    microaneurysms_mask = np.zeros_like(img[:, :, 0])  #1
-    hemorrhages_mask = np.zeros_like(img[:, :, 0])     #2
-    exudates_mask = np.zeros_like(img[:, :, 0])        #3
-    cotton_wool_mask = np.zeros_like(img[:, :, 0])     #4
-    neovascularization_mask = np.zeros_like(img[:, :, 0])  #5
-
-    # --- Microaneurysms (Red Dots) ---
-    lower_red1 = np.array([0, 50, 50])
-    upper_red1 = np.array([10, 255, 255])
-    lower_red2 = np.array([170, 50, 50])
-    upper_red2 = np.array([180, 255, 255])
-    mask_red = cv2.bitwise_or(
-        cv2.inRange(hsv, lower_red1, upper_red1),
-        cv2.inRange(hsv, lower_red2, upper_red2)
-    )
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-    microaneurysms_mask = cv2.morphologyEx(mask_red, cv2.MORPH_OPEN, kernel)
+def threshold_sliders():
+    """Slider values for the mask parameters, starting from the defaults"""
+    from clearsight.annotation import DEFAULT_PARAMS
 
-    # --- Hemorrhages (Larger Red Patches) ---with st.expander
-    
-    _, hemorrhages_mask = cv2.threshold(mask_red, 127, 255, cv2.THRESH_BINARY)
-    hemorrhages_mask = cv2.morphologyEx(hemorrhages_mask, cv2.MORPH_CLOSE, kernel)
+    if st.button("Reset to defaults", key="tune_reset"):
+        for name in DEFAULT_PARAMS:
+            st.session_state.pop(f"tune_{name}", None)
+    d = DEFAULT_PARAMS
+    left, right = st.columns(2)
+    with left:
+        params = {
+            "red_low_hue_max": st.slider("Red hue, low band upper bound", 0, 30, d["red_low_hue_max"],
+                                         key="tune_red_low_hue_max"),
+            "red_high_hue_min": st.slider("Red hue, high band lower bound", 150, 180, d["red_high_hue_min"],
+                                          key="tune_red_high_hue_min"),
+            "red_min_saturation": st.slider("Red minimum saturation", 0, 255, d["red_min_saturation"],
+                                            key="tune_red_min_saturation"),
+            "red_min_value": st.slider("Red minimum brightness", 0, 255, d["red_min_value"],
+                                       key="tune_red_min_value"),
+        }
+    with right:
+        params |= {
+            "exudate_min_lab_b": st.slider("Exudates: LAB b* threshold", 100, 220, d["exudate_min_lab_b"],
+                                           key="tune_exudate_min_lab_b"),
+            "cotton_wool_min_green": st.slider("Cotton wool: green threshold", 100, 255, d["cotton_wool_min_green"],
+                                               key="tune_cotton_wool_min_green"),
+            "small_kernel": st.select_slider("Small lesion kernel (px)", [1, 3, 5, 7, 9], d["small_kernel"],
+                                             key="tune_small_kernel"),
+            "vessel_kernel": st.select_slider("Vessel kernel (px)", [3, 5, 7, 9, 11, 13, 15], d["vessel_kernel"],
+                                              key="tune_vessel_kernel"),
+        }
+    return params
 
-    # --- Hard/Soft Exudates (Yellow-White) ---
-    L, A, B = cv2.split(lab)
-    _, exudates_mask = cv2.threshold(B, 145, 255, cv2.THRESH_BINARY)
 
-    # --- Cotton Wool Spots (Fluffy White) ---
-    green_channel = img[:, :, 1]
-    _, cotton_wool_mask = cv2.threshold(green_channel, 180, 255, cv2.THRESH_BINARY)
-    cotton_wool_mask = cv2.morphologyEx(cotton_wool_mask, cv2.MORPH_OPEN, kernel)
+def session_tuner(data):
+    """This session's ``MaskTuner`` for ``data``, decoding the image only when it changes"""
+    from clearsight.annotation import MaskTuner, content_key, decode
 
-    # --- Neovascularization (Abnormal Vessels) ---
-    kernel_vessel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-    neovascularization_mask = cv2.morphologyEx(mask_red, cv2.MORPH_GRADIENT, kernel_vessel)
-    neovascularization_mask = cv2.threshold(neovascularization_mask, 40, 255, cv2.THRESH_BINARY)[1]
+    key = content_key(data)
+    cached = st.session_state.get("annotation_tuner")
+    if cached is None or cached[0] != key:
+        with timed("annotation_decode"):
+            image = decode(data)
+        cached = st.session_state.annotation_tuner = (key, MaskTuner(image))
+    return cached[1]
 
-    return {
-        "neovascularization": neovascularization_mask,
-        "microaneurysms": microaneurysms_mask,
-        "hemorrhages": hemorrhages_mask,
-        "exudates": exudates_mask,
-        "cotton_wool": cotton_wool_mask
-    }
 
 def main():
     # Custom CSS for gradients and styling
@@ -203,7 +195,6 @@ def main():
 
     uploaded_file = None
     selected_sample_path = None
-    tmp_path = None
 
     if input_option == "Upload Image":
         uploaded_file = st.file_uploader(
@@ -221,17 +212,19 @@ def main():
 
     # Load the selected or uploaded image
     if uploaded_file or selected_sample_path:
-        if uploaded_file:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
-        else:
-            tmp_path = selected_sample_path
-
         try:
+            # OpenCV is only needed once there is an image to annotate
+            from clearsight.annotation import LESION_COLORS, LESION_LABELS, LESIONS, get_view
+
+            if uploaded_file:
+                data = uploaded_file.getvalue()
+            else:
+                with open(selected_sample_path, "rb") as f:
+                    data = f.read()
+
             with st.spinner('🔍 Analyzing retinal features...'):
-                masks = create_annotation_masks(tmp_path)
-                original_img = cv2.cvtColor(cv2.imread(tmp_path), cv2.COLOR_BGR2RGB)
+                # Masks and display layers are computed once per distinct image and reused on every rerun
+                view = get_view(data)
                 
                 # Layout with enhanced styling
                 col1, col2 = st.columns([1, 2], gap="large")
@@ -239,49 +232,46 @@ def main():
                 with col1:
                     st.markdown("### Original Image 📷")
                     st.markdown('<div class="image-container">', unsafe_allow_html=True)
-                    st.image(original_img, use_container_width=True)
+                    with timed("annotation_render"):
+                        st.image(view.image, use_container_width=True)
                     st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col2:
                     st.markdown("### Pathology Visualization 🔬")
-                    tabs = st.tabs([
-                        "🧬 Microaneurysms", 
-                        "🕸️ Neovascularization",
-                        "🩸 Hemorrhages", 
-                        "💡 Exudates", 
-                        "☁️ Cotton Wool" 
-
-                    ])
-                    
-                    tab_content = [
-                        masks["microaneurysms"],
-                        masks["neovascularization"],
-                        masks["hemorrhages"],
-                        masks["exudates"],
-                        masks["cotton_wool"]
-                    ]
-                    
-                    for tab, content, color in zip(tabs, tab_content, ["#FF6B6B", "#FF6B6B", "#F9C74F", "#90BE6D", "#577590"]):
-                        with tab:
-                            st.markdown(f'<div class="image-container" style="border: 2px solid {color}">', unsafe_allow_html=True)
-                            st.image(content, use_container_width=True)
-                            st.markdown('</div>', unsafe_allow_html=True)
+                    if st.toggle("🎚️ Tune thresholds", key="annotation_tune"):
+                        params = threshold_sliders()
+                        # Only the steps that depend on a changed slider are recomputed
+                        with timed("annotation_tune"):
+                            tuner = session_tuner(data)
+                            view = tuner.view(params)
+                        if tuner.scale < 1:
+                            st.caption(f"Large image: tuning preview at {tuner.scale:.0%} of full resolution.")
+                    else:
+                        # The tuner holds several image-sized planes; free them once tuning is switched off
+                        st.session_state.pop("annotation_tuner", None)
+                    shown = st.pills("Lesions", LESIONS, selection_mode="multi", default=LESIONS,
+                                     format_func=LESION_LABELS.get, key="annotation_lesions") or []
+                    legend = " ".join(
+                        f'<span style="color: rgb{LESION_COLORS[lesion]}">&#9632;</span> '
+                        f'{LESION_LABELS[lesion]} ({view.coverage[lesion]:.1%})'
+                        for lesion in LESIONS
+                    )
+                    st.markdown(legend, unsafe_allow_html=True)
+                    st.markdown('<div class="image-container">', unsafe_allow_html=True)
+                    with timed("annotation_render"):
+                        st.image(view.overlay(shown), use_container_width=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
             
-            st.success("✅ Analysis complete! Switch between tabs to explore different pathologies.")
+            st.success("✅ Analysis complete! Toggle lesion types to explore different pathologies.")
             
         except Exception as e:
             st.error(f"⚠️ Error processing image: {str(e)}")
             st.warning("Please ensure you've uploaded a valid fundus image in proper lighting conditions.")
-        finally:
-            try:
-                if uploaded_file:  # Only delete if it was an uploaded file
-                    os.unlink(tmp_path)
-            except Exception as cleanup_error:
-                st.warning(f"Warning: Temporary file cleanup failed - {str(cleanup_error)}")
 
 
 if __name__ == "__main__":
-    main()
+    with profile_rerun("annotation", st.query_params):
+        main()
 
 # Footer
 st.markdown("---")
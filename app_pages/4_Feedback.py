@@ -1,18 +1,23 @@
 import streamlit as st
 from streamlit_lottie import st_lottie
 import datetime
-import firebase_admin
-from firebase_admin import credentials, firestore
 import json
 
-# Initialize Firebase only once
-if not firebase_admin._apps:
-    # Load credentials directly from Streamlit secrets
-    firebase_config = dict(st.secrets["firebase"])
-    cred = credentials.Certificate(firebase_config)
-    firebase_admin.initialize_app(cred)
-    
-db = firestore.client()
+from clearsight.metrics import count, timed
+from clearsight.profiling import profile_rerun
+
+def get_db():
+    """Firestore client, initialising Firebase on first use so the page renders without it"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    # Initialize Firebase only once
+    if not firebase_admin._apps:
+        # Load credentials directly from Streamlit secrets
+        firebase_config = dict(st.secrets["firebase"])
+        cred = credentials.Certificate(firebase_config)
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
 
 def nav_page(page_name, timeout_secs=1):
     nav_script = """
@@ -38,18 +43,21 @@ def nav_page(page_name, timeout_secs=1):
 def save_feedback(data):
     """Save feedback to Firestore"""
     try:
-        doc_ref = db.collection('feedback').document()
-        doc_ref.set({
-            'timestamp': datetime.datetime.now().isoformat(),
-            'name': data['name'],
-            'email': data['email'],
-            'role': data['role'],
-            'rating': data['rating'],
-            'comments': data['comments'],
-            'app_version': '1.0.0'
-        })
+        with timed("feedback_save"):
+            doc_ref = get_db().collection('feedback').document()
+            doc_ref.set({
+                'timestamp': datetime.datetime.now().isoformat(),
+                'name': data['name'],
+                'email': data['email'],
+                'role': data['role'],
+                'rating': data['rating'],
+                'comments': data['comments'],
+                'app_version': '1.0.0'
+            })
+        count("feedback", "saved")
         return True
     except Exception as e:
+        count("feedback", "failed")
         st.error(f"Error saving feedback: {str(e)}")
         return False
 
@@ -215,7 +223,8 @@ def main():
     feedback_form()
 
 if __name__ == "__main__":
-    main()
+    with profile_rerun("feedback", st.query_params):
+        main()
 
     st.markdown("---")
 col1, col2, col3 = st.columns([1, 2, 1])
@@ -0,0 +1,71 @@
+import hmac
+import os
+
+import pandas as pd
+import streamlit as st
+
+from clearsight import config, metrics
+from clearsight.models import get_registry
+from clearsight.profiling import list_profiles
+
+st.set_page_config(page_title="Admin - ClearSight.AI", page_icon="🛠️", layout="wide",
+                   initial_sidebar_state="collapsed")
+
+# Only reachable with ?token=<CLEARSIGHT_ADMIN_TOKEN>; everyone else sees an empty page
+token = st.query_params.get("token", "")
+if not config.ADMIN_TOKEN or not hmac.compare_digest(token, config.ADMIN_TOKEN):
+    st.stop()
+
+st.title("🛠️ Runtime Metrics")
+
+registry = get_registry()
+col1, col2, col3 = st.columns(3)
+col1.metric("Model registry", registry.status)
+col2.metric("Backend", config.BACKEND + (" + int8 gate" if config.QUANTIZED_GATE else ""))
+col3.metric("Model load time", f"{registry.load_seconds:.1f}s" if registry.load_seconds else "-")
+if registry.error:
+    st.error(f"Last load error: {registry.error}")
+
+st.subheader("Stage latency")
+rows = metrics.summary()
+if rows:
+    st.dataframe(pd.DataFrame(rows).round(2), use_container_width=True, hide_index=True)
+else:
+    st.info("No requests recorded since the server started.")
+
+st.subheader("Events")
+events = [{"event": event, "outcome": outcome, "count": n}
+          for (event, outcome), n in sorted(metrics.EVENTS.snapshot().items())]
+if events:
+    st.dataframe(pd.DataFrame(events), use_container_width=True, hide_index=True)
+
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("Result cache")
+    st.json(registry.result_cache.stats() if registry.result_cache else {"enabled": False})
+with col2:
+    st.subheader("Micro-batcher")
+    st.json(registry.batcher.stats() if registry.batcher else {"enabled": False})
+
+with st.expander("Prometheus exposition"):
+    st.caption("Scraped from /metrics on CLEARSIGHT_METRICS_PORT (default 9464)")
+    st.code(metrics.render(), language="text")
+
+st.subheader("Profiles")
+st.caption("Profile one rerun of any page by adding ?profile=1&token=<admin token> to its URL, "
+           "or every rerun with CLEARSIGHT_PROFILE=1")
+profiles = list_profiles()
+if not profiles:
+    st.info("No profiles recorded yet.")
+for path in profiles:
+    with st.expander(os.path.basename(path)):
+        for name in sorted(os.listdir(path)):
+            file_path = os.path.join(path, name)
+            if os.path.isfile(file_path):
+                with open(file_path, "rb") as f:
+                    st.download_button(f"⬇️ {name}", f.read(), file_name=f"{os.path.basename(path)}-{name}",
+                                       key=file_path)
+        summary_path = os.path.join(path, "summary.txt")
+        if os.path.exists(summary_path):
+            with open(summary_path) as f:
+                st.code(f.read(), language="text")
@@ -0,0 +1 @@
+"""Shared inference code for the ClearSight.AI pages and tools."""
@@ -0,0 +1,423 @@
+"""Colour-threshold lesion masks for the Annotation page.
+
+The image is decoded once, from bytes or a path, and kept in OpenCV's BGR
+order; ``st.image(..., channels="BGR")`` shows it without another conversion.
+HSV and LAB are each computed once, the red mask is shared by the three
+red-derived lesion types, and all five masks are written into one ``(5, H, W)``
+block allocated up front.
+
+Images whose working buffers would exceed ``config.ANNOTATION_MEMORY_MB`` are
+processed in horizontal strips on a thread pool (OpenCV releases the GIL).
+Each strip is read with ``halo(params)`` extra rows on both sides, enough for every
+morphology op to see the same neighbourhood as in a full-image pass, so the
+tiled masks are identical.
+
+For display, ``get_view`` reduces the image and its masks once to
+``config.ANNOTATION_DISPLAY_SIZE`` and caches them by a hash of the encoded
+bytes, so reruns and lesion toggles only composite small cached layers. The
+same pass measures each lesion type (``lesion_metrics``), which is what a
+diagnosis stores and the Results page and reports show.
+"""
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from clearsight import config, threads
+from clearsight.metrics import count, timed
+
+threads.configure_opencv()
+
+# Order of the mask planes returned by ``compute_masks``
+LESIONS = ["microaneurysms", "neovascularization", "hemorrhages", "exudates", "cotton_wool"]
+
+LESION_LABELS = {
+    "microaneurysms": "Microaneurysms",
+    "neovascularization": "Neovascularization",
+    "hemorrhages": "Hemorrhages",
+    "exudates": "Exudates",
+    "cotton_wool": "Cotton Wool Spots",
+}
+# Overlay colours (RGB)
+LESION_COLORS = {
+    "microaneurysms": (255, 107, 107),
+    "neovascularization": (199, 125, 255),
+    "hemorrhages": (249, 199, 79),
+    "exudates": (144, 190, 109),
+    "cotton_wool": (76, 201, 240),
+}
+
+# Mask parameters; functions taking ``params`` accept a partial dict that overrides these
+DEFAULT_PARAMS = {
+    # Red lesions: OpenCV hue runs 0-179, so red is two bands at either end
+    "red_low_hue_max": 10,
+    "red_high_hue_min": 170,
+    "red_min_saturation": 50,
+    "red_min_value": 50,
+    # Exudates: LAB b* (yellowness) above this
+    "exudate_min_lab_b": 145,
+    # Cotton wool spots: green channel above this
+    "cotton_wool_min_green": 180,
+    # Odd structuring element sizes: ellipse for open/close, rectangle for the vessel gradient
+    "small_kernel": 3,
+    "vessel_kernel": 5,
+}
+# Parameters each lesion's mask depends on
+RED_PARAMS = ("red_low_hue_max", "red_high_hue_min", "red_min_saturation", "red_min_value")
+LESION_PARAMS = {
+    "microaneurysms": RED_PARAMS + ("small_kernel",),
+    "neovascularization": RED_PARAMS + ("vessel_kernel",),
+    "hemorrhages": RED_PARAMS + ("small_kernel",),
+    "exudates": ("exudate_min_lab_b",),
+    "cotton_wool": ("cotton_wool_min_green", "small_kernel"),
+}
+
+# Working bytes per pixel of a strip: colour scratch (3), red and plane (2), strip masks (5)
+WORKING_BYTES_PER_PIXEL = 10
+# Held by a MaskTuner: HSV (3), LAB b*, green, scratch and red planes, five lesion masks
+TUNER_BYTES_PER_PIXEL = 12
+MIN_STRIP_ROWS = 16
+MAX_OVERLAYS_PER_VIEW = 4
+
+
+def decode(source):
+    """Decode ``source`` (bytes, a file-like object or a path) to a BGR uint8 image"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = source
+    elif hasattr(source, "read"):
+        data = source.read()
+    else:
+        try:
+            with open(source, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise ValueError(f"Image not found at path: {source}") from None
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image")
+    return image
+
+
+def resolve_params(params=None):
+    return {**DEFAULT_PARAMS, **params} if params else DEFAULT_PARAMS
+
+
+@functools.lru_cache(maxsize=32)
+def _kernel(shape, size):
+    return cv2.getStructuringElement(shape, (size, size))
+
+
+def halo(params):
+    """Rows of context a strip needs so every morphology op sees its full neighbourhood"""
+    # Open/close chain two ops of the small kernel; the gradient is one pass of the vessel kernel
+    return max(2 * (params["small_kernel"] // 2), params["vessel_kernel"] // 2)
+
+
+def red_mask(hsv, params, out, scratch):
+    """Both red hue bands of an HSV image into ``out`` (``scratch`` is a same-size plane)"""
+    low = (0, params["red_min_saturation"], params["red_min_value"])
+    cv2.inRange(hsv, low, (params["red_low_hue_max"], 255, 255), dst=out)
+    cv2.inRange(hsv, (params["red_high_hue_min"],) + low[1:], (180, 255, 255), dst=scratch)
+    return cv2.bitwise_or(out, scratch, dst=out)
+
+
+def red_lesion_mask(lesion, red, params, out):
+    """A red-derived lesion mask from the red mask.
+
+    The red mask is already 0/255, and so are its opening, closing and
+    gradient, so the binary thresholds the original pipeline applied to them
+    were no-ops and are skipped.
+    """
+    if lesion == "microaneurysms":
+        return cv2.morphologyEx(red, cv2.MORPH_OPEN, _kernel(cv2.MORPH_ELLIPSE, params["small_kernel"]), dst=out)
+    if lesion == "hemorrhages":
+        return cv2.morphologyEx(red, cv2.MORPH_CLOSE, _kernel(cv2.MORPH_ELLIPSE, params["small_kernel"]), dst=out)
+    return cv2.morphologyEx(red, cv2.MORPH_GRADIENT, _kernel(cv2.MORPH_RECT, params["vessel_kernel"]), dst=out)
+
+
+def exudate_mask(lab_b, params, out):
+    return cv2.threshold(lab_b, params["exudate_min_lab_b"], 255, cv2.THRESH_BINARY, dst=out)[1]
+
+
+def cotton_wool_mask(green, params, out, scratch):
+    cv2.threshold(green, params["cotton_wool_min_green"], 255, cv2.THRESH_BINARY, dst=scratch)
+    return cv2.morphologyEx(scratch, cv2.MORPH_OPEN, _kernel(cv2.MORPH_ELLIPSE, params["small_kernel"]), dst=out)
+
+
+def _masks_into(image, out, params):
+    height, width = image.shape[:2]
+    microaneurysms, neovascularization, hemorrhages, exudates, cotton_wool = out
+    color = np.empty_like(image)  # HSV first, then reused for LAB
+    red = np.empty((height, width), np.uint8)
+    plane = np.empty((height, width), np.uint8)
+
+    cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=color)
+    red_mask(color, params, red, plane)
+    for lesion, mask in (("microaneurysms", microaneurysms), ("hemorrhages", hemorrhages),
+                         ("neovascularization", neovascularization)):
+        red_lesion_mask(lesion, red, params, mask)
+
+    cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=color)
+    exudate_mask(cv2.extractChannel(color, 2, dst=plane), params, exudates)
+    cotton_wool_mask(cv2.extractChannel(image, 1, dst=red), params, cotton_wool, plane)
+    return out
+
+
+def compute_masks(image, out=None, memory_mb=None, workers=None, params=None):
+    """Compute the lesion masks of a BGR image into ``out`` (``(5, H, W)`` uint8, ``LESIONS`` order).
+
+    Working memory on top of ``image`` and ``out`` stays under ``memory_mb``
+    (default ``config.ANNOTATION_MEMORY_MB``), except that a strip is never
+    shorter than ``MIN_STRIP_ROWS``.
+    """
+    params = resolve_params(params)
+    height, width = image.shape[:2]
+    if out is None:
+        out = np.empty((len(LESIONS), height, width), np.uint8)
+    budget = (memory_mb or config.ANNOTATION_MEMORY_MB) * 2 ** 20
+    row_bytes = width * WORKING_BYTES_PER_PIXEL
+    if height * row_bytes <= budget:
+        return _masks_into(image, out, params)
+
+    context = halo(params)
+    workers = workers or threads.settings()["opencv"]
+    workers = max(1, min(workers, budget // ((MIN_STRIP_ROWS + 2 * context) * row_bytes)))
+    rows = max(MIN_STRIP_ROWS, budget // (workers * row_bytes) - 2 * context)
+
+    def run(top):
+        bottom = min(top + rows, height)
+        lo, hi = max(0, top - context), min(height, bottom + context)
+        strip = _masks_into(image[lo:hi], np.empty((len(LESIONS), hi - lo, width), np.uint8), params)
+        out[:, top:bottom] = strip[:, top - lo:bottom - lo]
+
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(run, range(0, height, rows)))
+    return out
+
+
+def save_masks(path, masks):
+    """Store a ``(5, H, W)`` mask block as one bit-packed, zlib-compressed ``.npz`` (1 bit per pixel per lesion)"""
+    masks = np.asarray(masks)
+    packed = np.packbits(masks > 0, axis=-1)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, packed=packed, width=np.int64(masks.shape[-1]), lesions=np.array(LESIONS))
+    os.replace(tmp, path)
+
+
+def load_masks(path):
+    """Read a file written by ``save_masks`` back to ``{lesion: uint8 0/255 mask}``"""
+    with np.load(path) as f:
+        packed, width, lesions = f["packed"], int(f["width"]), [str(name) for name in f["lesions"]]
+    masks = np.unpackbits(packed, axis=-1, count=width)
+    masks *= 255
+    return dict(zip(lesions, masks))
+
+
+def annotate(source):
+    """Decode ``source`` once and return ``(bgr_image, {lesion: mask})``"""
+    image = decode(source)
+    return image, dict(zip(LESIONS, compute_masks(image)))
+
+
+def create_annotation_masks(source):
+    """Return ``{lesion: mask}`` for an image path or encoded image bytes"""
+    return annotate(source)[1]
+
+
+@functools.lru_cache(maxsize=16)
+def _color_plate(width, height, color):
+    # Built once per size: filling an HxWx3 array from a 3-tuple is slow in numpy
+    return cv2.merge([np.full((height, width), value, np.uint8) for value in color])
+
+
+def display_size(image):
+    """``(width, height)`` of ``image`` scaled to fit ``config.ANNOTATION_DISPLAY_SIZE``"""
+    height, width = image.shape[:2]
+    scale = min(1.0, config.ANNOTATION_DISPLAY_SIZE / max(height, width))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def display_image(image, size):
+    """BGR image reduced to ``size`` as RGB, ready for ``st.image``"""
+    return cv2.cvtColor(cv2.resize(image, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+
+
+def reduce_mask(mask, size):
+    # Area averaging keeps sub-pixel lesions as partial coverage instead of dropping them
+    return cv2.resize(mask, size, interpolation=cv2.INTER_AREA)
+
+
+def mask_coverage(mask):
+    return cv2.countNonZero(mask) / mask.size
+
+
+def lesion_metrics(masks, connectivity=8):
+    """Per-lesion counts and extent of full-resolution ``(5, H, W)`` masks.
+
+    Every lesion is one connected component of its mask; the component areas
+    come from a single ``connectedComponentsWithStats`` call per mask, so
+    there is no per-lesion Python loop. Returns ``{lesion: {"count",
+    "area_px", "area_fraction", "largest_px", "density_per_mpx"}}`` with plain
+    ``int``/``float`` values, ready to store with a diagnosis.
+    """
+    metrics = {}
+    for lesion, mask in zip(LESIONS, masks):
+        # Grana's block-based labelling is ~1.6x faster than the default here and runs in parallel
+        _, _, stats, _ = cv2.connectedComponentsWithStatsWithAlgorithm(mask, connectivity, cv2.CV_32S, cv2.CCL_GRANA)
+        areas = stats[1:, cv2.CC_STAT_AREA]  # row 0 is the background
+        area = int(areas.sum())
+        metrics[lesion] = {
+            "count": len(areas),
+            "area_px": area,
+            "area_fraction": area / mask.size,
+            "largest_px": int(areas.max()) if len(areas) else 0,
+            "density_per_mpx": len(areas) / (mask.size / 1e6),
+        }
+    return metrics
+
+
+class AnnotationView:
+    """Display-resolution image and lesion layers of one annotated image.
+
+    ``image`` is RGB, ``layers`` the ``(5, h, w)`` masks reduced to the same
+    size (0-255 coverage per display pixel), ``coverage`` the fraction of
+    full-resolution pixels in each mask and ``metrics`` the full-resolution
+    ``lesion_metrics`` (None for views that skip them).
+    """
+
+    def __init__(self, image, layers, coverage, metrics=None):
+        self.image = image
+        self.layers = layers
+        self.coverage = coverage
+        self.metrics = metrics
+        self._overlays = OrderedDict()
+
+    @classmethod
+    def from_masks(cls, image, masks, metrics=None):
+        """Reduce a full-resolution BGR image and its ``(5, H, W)`` masks to display size"""
+        size = display_size(image)
+        return cls(display_image(image, size),
+                   np.stack([reduce_mask(mask, size) for mask in masks]),
+                   {lesion: mask_coverage(mask) for lesion, mask in zip(LESIONS, masks)},
+                   metrics)
+
+    def overlay(self, lesions, opacity=0.65):
+        """RGB image with the chosen lesions blended in their colours; the last few selections are kept"""
+        key = (tuple(lesion for lesion in LESIONS if lesion in lesions), opacity)
+        if key in self._overlays:
+            self._overlays.move_to_end(key)
+            return self._overlays[key]
+        out = self.image
+        height, width = out.shape[:2]
+        for lesion in key[0]:
+            alpha = self.layers[LESIONS.index(lesion)].astype(np.float32)
+            alpha *= opacity / 255
+            out = cv2.blendLinear(out, _color_plate(width, height, LESION_COLORS[lesion]), 1 - alpha, alpha)
+        self._overlays[key] = out
+        while len(self._overlays) > MAX_OVERLAYS_PER_VIEW:
+            self._overlays.popitem(last=False)
+        return out
+
+
+_views = OrderedDict()
+_views_lock = threading.Lock()
+
+
+def content_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_view(data):
+    """``AnnotationView`` of encoded image ``data`` with the default parameters, computed once per distinct content"""
+    key = content_key(data)
+    with _views_lock:
+        view = _views.get(key)
+        if view is not None:
+            _views.move_to_end(key)
+    if view is not None:
+        count("annotation_cache", "hit")
+        return view
+
+    count("annotation_cache", "miss")
+    with timed("annotation_decode"):
+        image = decode(data)
+    with timed("annotation_masks"):
+        masks = compute_masks(image)
+    with timed("lesion_metrics"):
+        metrics = lesion_metrics(masks)
+    view = AnnotationView.from_masks(image, masks, metrics)
+    with _views_lock:
+        _views[key] = view
+        while len(_views) > config.ANNOTATION_CACHE_ENTRIES:
+            _views.popitem(last=False)
+    return view
+
+
+class MaskTuner:
+    """Interactive re-thresholding of one image.
+
+    Keeps the HSV, LAB b* and green planes, and every intermediate mask with
+    the parameter values it was computed from (see ``LESION_PARAMS``), so a
+    slider change redoes only the thresholds and morphology that depend on
+    it. Meant to live in one user's session, so what it holds is capped at
+    ``memory_mb`` (default ``config.ANNOTATION_MEMORY_MB``): a larger image is
+    tuned on a copy scaled down to fit, and ``scale`` says by how much.
+    """
+
+    def __init__(self, image, memory_mb=None):
+        self.size = display_size(image)
+        self.image = display_image(image, self.size)
+        height, width = image.shape[:2]
+        budget = (memory_mb or config.ANNOTATION_MEMORY_MB) * 2 ** 20
+        self.scale = min(1.0, (budget / (height * width * TUNER_BYTES_PER_PIXEL)) ** 0.5)
+        if self.scale < 1:
+            image = cv2.resize(image, (max(1, int(width * self.scale)), max(1, int(height * self.scale))),
+                               interpolation=cv2.INTER_AREA)
+        self.hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        self.lab_b = cv2.extractChannel(cv2.cvtColor(image, cv2.COLOR_BGR2LAB), 2)
+        self.green = cv2.extractChannel(image, 1)
+        self._scratch = np.empty_like(self.green)
+        self._steps = {}
+
+    def _step(self, name, key, compute):
+        cached = self._steps.get(name)
+        if cached is None or cached[0] != key:
+            cached = self._steps[name] = (key, compute())
+        return cached[1]
+
+    def _red(self, params):
+        return self._step("red", tuple(params[name] for name in RED_PARAMS),
+                          lambda: red_mask(self.hsv, params, np.empty_like(self.green), self._scratch))
+
+    def mask(self, lesion, params):
+        """Mask of ``lesion`` at the tuning resolution (full resolution times ``scale``)"""
+        params = resolve_params(params)
+
+        def compute():
+            out = np.empty_like(self.green)
+            if lesion == "exudates":
+                return exudate_mask(self.lab_b, params, out)
+            if lesion == "cotton_wool":
+                return cotton_wool_mask(self.green, params, out, self._scratch)
+            return red_lesion_mask(lesion, self._red(params), params, out)
+
+        return self._step(lesion, tuple(params[name] for name in LESION_PARAMS[lesion]), compute)
+
+    def view(self, params=None):
+        """``AnnotationView`` for ``params``, rebuilding only the layers whose parameters changed"""
+        params = resolve_params(params)
+        layers, coverage = [], {}
+        for lesion in LESIONS:
+            key = tuple(params[name] for name in LESION_PARAMS[lesion])
+            layer, coverage[lesion] = self._step(
+                f"{lesion}:layer", key,
+                lambda: (reduce_mask(self.mask(lesion, params), self.size), mask_coverage(self.mask(lesion, params))))
+            layers.append(layer)
+        return self._step("view", tuple(sorted(params.items())),
+                          lambda: AnnotationView(self.image, np.stack(layers), coverage))
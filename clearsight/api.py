@@ -0,0 +1,241 @@
+"""HTTP inference API for programmatic screening (PACS integration etc).
+
+    POST /v1/screen        body: raw image bytes           -> one result object
+    POST /v1/screen/batch  body: multipart/form-data files -> {"results": [...]}
+    GET  /healthz                                          -> model registry status
+    GET  /metrics                                          -> Prometheus text exposition
+
+A result object has ``accepted``, ``retina_prob``, ``stage``, ``stage_name``
+and ``confidence``; the last three are null for non-retinal images.
+
+The server speaks HTTP/1.1 with keep-alive and handles each connection on
+its own thread. It uses the process-wide model registry, so when started
+from the Streamlit pages (set ``CLEARSIGHT_API_PORT``) it shares the models,
+result cache and micro-batcher with the UI. It can also run on its own:
+
+    python -m clearsight.api --port 8502
+
+The Prometheus endpoint does not depend on the API being enabled:
+``ensure_metrics_server`` serves ``GET /metrics`` alone on
+``CLEARSIGHT_METRICS_PORT`` (default 9464) from every Streamlit process.
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from clearsight import config, metrics
+from clearsight.models import LOADED, get_registry
+
+
+class BadRequest(Exception):
+    pass
+
+
+def to_response(result):
+    stage = result['stage']
+    return {
+        "accepted": stage is not None,
+        "retina_prob": result['retina_prob'],
+        "stage": stage,
+        "stage_name": config.DR_STAGE_NAMES[stage] if stage is not None else None,
+        "confidence": result['confidence'],
+    }
+
+
+def decode_image(data, name="body"):
+    from clearsight.preprocessing import decode
+
+    try:
+        return decode(io.BytesIO(data))
+    except Exception as e:
+        raise BadRequest(f"{name}: not a readable image ({e})")
+
+
+def parse_multipart(content_type, body):
+    """Return ``[(filename, bytes)]`` for every file part of a multipart/form-data body"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    if not message.is_multipart():
+        raise BadRequest("Expected a multipart/form-data body")
+    files = []
+    for part in message.iter_parts():
+        name = part.get_filename() or part.get_param("name", header="content-disposition") or f"file{len(files)}"
+        files.append((name, part.get_payload(decode=True) or b""))
+    return files
+
+
+class ScreeningHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response stalls on the client's delayed ACK
+    disable_nagle_algorithm = True
+    server_version = "ClearSightAPI/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            # Without a usable length the body cannot be skipped, so this connection cannot be reused
+            self.close_connection = True
+            raise BadRequest("Invalid Content-Length header") from None
+        if length <= 0:
+            raise BadRequest("Empty request body")
+        if length > config.API_MAX_BODY_MB * 2**20:
+            # The body is left unread, so this connection cannot be reused
+            self.close_connection = True
+            raise BadRequest(f"Request body larger than {config.API_MAX_BODY_MB} MB")
+        return self.rfile.read(length)
+
+    def send_metrics(self):
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.send_metrics()
+        elif self.path == "/healthz":
+            registry = get_registry()
+            self.send_json(200, {
+                "status": registry.status,
+                "error": str(registry.error) if registry.error else None,
+                "load_seconds": registry.load_seconds,
+            })
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            if self.path == "/v1/screen":
+                images = [decode_image(self.read_body())]
+            elif self.path == "/v1/screen/batch":
+                files = parse_multipart(self.headers.get("Content-Type", ""), self.read_body())
+                images = [decode_image(data, name) for name, data in files]
+                if not images:
+                    raise BadRequest("No files in request")
+            else:
+                self.close_connection = True  # body not read
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+        except BadRequest as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        registry = get_registry()
+        try:
+            results = [to_response(r) for r in registry.screen(images)]
+        except Exception as e:
+            status = 500 if registry.status == LOADED else 503
+            self.send_json(status, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        if self.path == "/v1/screen":
+            self.send_json(200, results[0])
+        else:
+            self.send_json(200, {"results": [dict(r, file=name) for (name, _), r in zip(files, results)]})
+
+
+def make_server(host=config.API_HOST, port=config.API_PORT):
+    server = ThreadingHTTPServer((host, port), ScreeningHandler)
+    server.daemon_threads = True
+    return server
+
+
+class MetricsHandler(ScreeningHandler):
+    """Serves ``GET /metrics`` only"""
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.send_metrics()
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        self.close_connection = True  # body not read
+        self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+
+_server = None
+_server_lock = threading.Lock()
+_metrics_server = None
+
+
+def ensure_api_server():
+    """Start the API on a background thread once per process if ``CLEARSIGHT_API_PORT`` is set"""
+    global _server
+    if not config.API_PORT or _server is not None:
+        return _server or None
+    with _server_lock:
+        if _server is None:
+            try:
+                server = make_server()
+            except OSError as e:
+                # e.g. a second Streamlit process on this host; don't try again on every rerun
+                print(f"ClearSight API not served on port {config.API_PORT}: {e}", file=sys.stderr)
+                _server = False
+                return None
+            threading.Thread(target=server.serve_forever, name="clearsight-api", daemon=True).start()
+            _server = server
+            print(f"ClearSight API listening on http://{config.API_HOST}:{config.API_PORT}")
+    return _server or None
+
+
+def ensure_metrics_server():
+    """Serve ``/metrics`` on a background thread once per process unless ``CLEARSIGHT_METRICS_PORT`` is 0"""
+    global _metrics_server
+    if not config.METRICS_PORT or _metrics_server is not None:
+        return _metrics_server or None
+    with _server_lock:
+        if _metrics_server is None:
+            try:
+                server = ThreadingHTTPServer((config.METRICS_HOST, config.METRICS_PORT), MetricsHandler)
+            except OSError as e:
+                # e.g. a second Streamlit process on this host; don't try again on every rerun
+                print(f"ClearSight metrics not served on port {config.METRICS_PORT}: {e}", file=sys.stderr)
+                _metrics_server = False
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="clearsight-metrics", daemon=True).start()
+            _metrics_server = server
+            print(f"ClearSight metrics on http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics")
+    return _metrics_server or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.api", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=config.API_HOST)
+    parser.add_argument("--port", type=int, default=config.API_PORT or 8502)
+    args = parser.parse_args(argv)
+
+    get_registry().load()
+    server = make_server(args.host, args.port)
+    print(f"ClearSight API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Cross-session dynamic micro-batching.
+
+Every Streamlit session runs on its own thread. Instead of each of them
+pushing batch-of-one inferences through the models concurrently, sessions
+submit preprocessed images to one :class:`MicroBatcher`. Its worker thread
+collects requests for up to ``max_wait_ms`` or ``max_items``, runs them as a
+single batch through the gate and the DR model and resolves each request's
+future.
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+from clearsight import config
+from clearsight.pipeline import screen_preprocessed
+
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("binary_input", "dr_input", "future", "enqueued")
+
+    def __init__(self, binary_input, dr_input):
+        self.binary_input = binary_input
+        self.dr_input = dr_input
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    """Collects single-image requests from all sessions into model batches"""
+
+    def __init__(self, binary_model, dr_model, max_items=config.MICROBATCH_MAX_ITEMS,
+                 max_wait_ms=config.MICROBATCH_MAX_WAIT_MS):
+        self.binary_model = binary_model
+        self.dr_model = dr_model
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._requests = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._max_queue_depth = 0
+        self._thread = threading.Thread(target=self._run, name="clearsight-microbatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, binary_input, dr_input):
+        """Queue one preprocessed image; the future resolves to its result dict"""
+        request = _Request(binary_input, dr_input)
+        self._queue.put(request)
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return request.future
+
+    def close(self):
+        """Stop the worker thread once the requests queued so far are answered"""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        items = [first]
+        deadline = first.enqueued + self.max_wait
+        while len(items) < self.max_items:
+            timeout = deadline - time.perf_counter()
+            try:
+                # Past the deadline, still take whatever is already queued
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Answer this batch first; the next _collect sees the stop again
+                self._queue.put(_STOP)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if items is None:
+                return
+            started = time.perf_counter()
+            self._record(items, started)
+            try:
+                results = screen_preprocessed(
+                    self.binary_model,
+                    self.dr_model,
+                    np.stack([item.binary_input for item in items]),
+                    np.stack([item.dr_input for item in items]),
+                )
+            except Exception as e:
+                for item in items:
+                    item.future.set_exception(e)
+                continue
+            for item, result in zip(items, results):
+                item.future.set_result(result)
+
+    def _record(self, items, started):
+        waits = [started - item.enqueued for item in items]
+        with self._stats_lock:
+            self._batch_sizes[len(items)] += 1
+            self._requests += len(items)
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, *waits)
+
+    def stats(self):
+        with self._stats_lock:
+            batches = sum(self._batch_sizes.values())
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": batches,
+                "mean_batch_size": self._requests / batches if batches else 0.0,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "mean_wait_ms": 1000 * self._wait_total / self._requests if self._requests else 0.0,
+                "max_wait_ms": 1000 * self._wait_max,
+            }
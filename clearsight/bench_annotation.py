@@ -0,0 +1,140 @@
+"""Compare the Annotation page's old mask pipeline with ``clearsight.annotation``.
+
+    python -m clearsight.bench_annotation [--sizes 2048 4096] [--repeats 10] [--tile-memory-mb 32]
+
+All paths start from the encoded file, as the page does. The legacy path is
+the original page code (read from disk, five separate conversions and
+thresholds) plus the second ``imread`` the page made to show the original. The
+tiled path is the reworked engine held to ``--tile-memory-mb`` of working
+memory. The masks of every path are checked for equality before any timing is
+reported, and peak memory is the largest numpy allocation total seen by
+tracemalloc during one call.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from clearsight.annotation import LESIONS, annotate, compute_masks, decode
+from clearsight.benchmarks import synthetic_fundus
+
+
+def legacy_annotate(path):
+    """The pre-rework page pipeline, kept as the baseline"""
+    img = cv2.imread(path)
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
+    lab = cv2.cvtColor(img, cv2.COLOR_RGB2LAB)
+    microaneurysms_mask = np.zeros_like(img[:, :, 0])
+    hemorrhages_mask = np.zeros_like(img[:, :, 0])
+    exudates_mask = np.zeros_like(img[:, :, 0])
+    cotton_wool_mask = np.zeros_like(img[:, :, 0])
+    neovascularization_mask = np.zeros_like(img[:, :, 0])
+
+    mask_red = cv2.bitwise_or(
+        cv2.inRange(hsv, np.array([0, 50, 50]), np.array([10, 255, 255])),
+        cv2.inRange(hsv, np.array([170, 50, 50]), np.array([180, 255, 255]))
+    )
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    microaneurysms_mask = cv2.morphologyEx(mask_red, cv2.MORPH_OPEN, kernel)
+    _, hemorrhages_mask = cv2.threshold(mask_red, 127, 255, cv2.THRESH_BINARY)
+    hemorrhages_mask = cv2.morphologyEx(hemorrhages_mask, cv2.MORPH_CLOSE, kernel)
+    L, A, B = cv2.split(lab)
+    _, exudates_mask = cv2.threshold(B, 145, 255, cv2.THRESH_BINARY)
+    _, cotton_wool_mask = cv2.threshold(img[:, :, 1], 180, 255, cv2.THRESH_BINARY)
+    cotton_wool_mask = cv2.morphologyEx(cotton_wool_mask, cv2.MORPH_OPEN, kernel)
+    kernel_vessel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+    neovascularization_mask = cv2.morphologyEx(mask_red, cv2.MORPH_GRADIENT, kernel_vessel)
+    neovascularization_mask = cv2.threshold(neovascularization_mask, 40, 255, cv2.THRESH_BINARY)[1]
+    masks = {
+        "neovascularization": neovascularization_mask,
+        "microaneurysms": microaneurysms_mask,
+        "hemorrhages": hemorrhages_mask,
+        "exudates": exudates_mask,
+        "cotton_wool": cotton_wool_mask,
+    }
+    original = cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB)
+    return original, masks
+
+
+def reworked_annotate(path):
+    with open(path, "rb") as f:
+        return annotate(f.read())
+
+
+def tiled_annotate(path, memory_mb):
+    with open(path, "rb") as f:
+        image = decode(f.read())
+    return image, dict(zip(LESIONS, compute_masks(image, memory_mb=memory_mb)))
+
+
+def time_calls(fn, arg, repeats, warmup=1):
+    """Return per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        fn(arg)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(arg)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def peak_mb(fn, arg):
+    tracemalloc.start()
+    try:
+        fn(arg)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def check_parity(path, calls):
+    """Names of the masks any path in ``calls`` gets differently from the legacy pipeline"""
+    _, expected = legacy_annotate(path)
+    mismatched = []
+    for name, fn in calls.items():
+        _, actual = fn(path)
+        mismatched += [f"{name}:{lesion}" for lesion in expected if not np.array_equal(expected[lesion], actual[lesion])]
+    return mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.bench_annotation", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--tile-memory-mb", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    calls = {
+        "legacy": legacy_annotate,
+        "reworked": reworked_annotate,
+        "tiled": lambda path: tiled_annotate(path, args.tile_memory_mb),
+    }
+    print(f"{'size':>5} {'path':<9} {'p50 ms':>8} {'p95 ms':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"fundus_{size}.png")
+            cv2.imwrite(path, cv2.cvtColor(synthetic_fundus(size), cv2.COLOR_RGB2BGR))
+            mismatched = check_parity(path, {k: v for k, v in calls.items() if k != "legacy"})
+            if mismatched:
+                print(f"{size:>5} masks differ from the legacy pipeline: {', '.join(mismatched)}", file=sys.stderr)
+                return 1
+            p50 = {}
+            for name, fn in calls.items():
+                times = sorted(time_calls(fn, path, args.repeats))
+                p50[name] = statistics.median(times)
+                p95 = times[int(0.95 * (len(times) - 1))]
+                print(f"{size:>5} {name:<9} {p50[name]:>8.1f} {p95:>8.1f} {peak_mb(fn, path):>8.0f}")
+            print(f"{'':>5} speedup {p50['legacy'] / p50['reworked']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Compare per-call latency of ``model.predict`` and the DR serving function.
+
+    python -m clearsight.bench_dr [--batch-sizes 1 8] [--repeats 50]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from clearsight import config
+from clearsight.models import load_keras_stager
+
+
+def time_calls(fn, batch, repeats, warmup=3):
+    """Return per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        fn(batch)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(batch)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.bench_dr", description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    stager = load_keras_stager()
+    size = config.DR_INPUT_SIZE
+    rng = np.random.default_rng(0)
+    calls = {
+        "model.predict": lambda batch: stager.model.predict(batch, verbose=0),
+        "serving fn": stager.predict,
+    }
+
+    print(f"{'batch':>5} {'path':<14} {'p50 ms':>8} {'p95 ms':>8}")
+    for batch_size in args.batch_sizes:
+        batch = rng.random((batch_size, size, size, 3), dtype=np.float32)
+        p50 = {}
+        for name, fn in calls.items():
+            times = sorted(time_calls(fn, batch, args.repeats))
+            p50[name] = statistics.median(times)
+            p95 = times[int(0.95 * (len(times) - 1))]
+            print(f"{batch_size:>5} {name:<14} {p50[name]:>8.1f} {p95:>8.1f}")
+        print(f"{'':>5} speedup {p50['model.predict'] / p50['serving fn']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
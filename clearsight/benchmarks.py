@@ -0,0 +1,279 @@
+"""Benchmark suite for the screening and reporting hot paths.
+
+    python -m clearsight.benchmarks run --out results.json [--sizes 512 2048 4000]
+    python -m clearsight.benchmarks compare baseline.json results.json [--tolerance 0.15]
+
+All inputs are deterministic synthetic fundus-like images, so results from
+different runs and hosts are comparable. Every benchmark records p50/p95
+latency, throughput and the peak resident memory seen while it ran.
+``compare`` exits with status 1 when any benchmark's p50 is more than
+``--tolerance`` slower than the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import socketserver
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_SIZES = [512, 1024, 2048, 4000]
+
+
+def synthetic_fundus(size, seed=0):
+    """Return a deterministic ``size``x``size`` RGB uint8 image that looks roughly like a fundus photo"""
+    rng = np.random.default_rng(seed)
+    coords = (np.arange(size, dtype=np.float32) + 0.5) / size - 0.5
+    yy, xx = coords[:, None], coords[None, :]
+    r = np.hypot(xx, yy)
+    disc = r < 0.45
+    shade = np.clip(1 - r / 0.45, 0, 1)
+
+    img = np.zeros((size, size, 3), dtype=np.float32)
+    img[..., 0] = (110 + 110 * shade) * disc
+    img[..., 1] = (45 + 55 * shade) * disc
+    img[..., 2] = (15 + 25 * shade) * disc
+
+    # Dark, wavy vessels
+    for _ in range(10):
+        a, b, c, y0 = rng.uniform(0.02, 0.08), rng.uniform(4, 12), rng.uniform(0, 6.3), rng.uniform(-0.35, 0.35)
+        vessel = (np.abs(yy - y0 - a * np.sin(b * xx + c)) < 0.004) & disc
+        img[vessel] *= 0.55
+
+    # Bright optic disc
+    img[np.hypot(xx - 0.22, yy) < 0.06] = (250, 225, 160)
+
+    # Red dots / blots and yellow exudates
+    for colour, count, radius in (((150, 10, 10), 60, 0.004), ((140, 20, 15), 12, 0.012), ((235, 215, 90), 25, 0.006)):
+        for cx, cy in rng.uniform(-0.3, 0.3, size=(count, 2)):
+            lo_y, hi_y = np.searchsorted(coords, [cy - radius, cy + radius])
+            lo_x, hi_x = np.searchsorted(coords, [cx - radius, cx + radius])
+            window = np.hypot(xx[:, lo_x:hi_x] - cx, yy[lo_y:hi_y] - cy) < radius
+            img[lo_y:hi_y, lo_x:hi_x][window] = colour
+
+    img += rng.normal(0, 3, size=(size, size, 1)).astype(np.float32)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def _current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # No /proc (macOS): fall back to the process-wide peak; KiB on Linux, bytes on macOS
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class RssSampler:
+    """Polls resident memory on a background thread and keeps the peak"""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak_mb = _current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, _current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+
+def measure(fn, repeats, warmup=1, items=1):
+    """Time ``repeats`` calls of ``fn``; ``items`` is how many units one call processes"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    with RssSampler() as rss:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "n": repeats,
+        "p50_ms": 1000 * statistics.median(times),
+        "p95_ms": 1000 * times[min(len(times) - 1, int(0.95 * len(times)))],
+        "throughput_per_s": items * len(times) / sum(times),
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+
+class _SmtpStubHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept a message: no TLS, no auth, everything is 250"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.reply("220 localhost stub")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"DATA":
+                self.reply("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 bye")
+                return
+            elif command == b"EHLO":
+                self.reply("250 localhost")
+            else:
+                self.reply("250 OK")
+
+
+def smtp_stub():
+    """Start a local SMTP sink on a free port; returns the server (``server_address`` has the port)"""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SmtpStubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _report_inputs():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    data = {'stage': 2, 'confidence': 0.87, 'retina_prob': 0.98}
+    stage_info = ["Moderate DR", "#FF9800", "⚠️⚠️", "Multiple hemorrhages"]
+    pathologies = {
+        name: {"count": n, "area_px": n * 40, "area_fraction": n * 40 / 4e6, "largest_px": 120, "density_per_mpx": n / 4}
+        for name, n in [("Microaneurysms", 82), ("Hemorrhages", 74), ("Exudates", 61), ("Cotton Wool Spots", 48)]
+    }
+    fig_radar = go.Figure(go.Scatterpolar(r=[m["area_fraction"] * 100 for m in pathologies.values()],
+                                          theta=list(pathologies), fill='toself'))
+    fig_bars = px.bar(x=[m["count"] for m in pathologies.values()], y=list(pathologies), orientation='h')
+    fig_progression = px.line(x=list(range(6)), y=[0.5, 0.8, 1.2, 1.4, 1.9, 2])
+    return data, stage_info, pathologies, (fig_radar, fig_bars, fig_progression)
+
+
+def run(sizes, repeats, with_models=True):
+    from clearsight.annotation import create_annotation_masks
+    from clearsight.preprocessing import preprocess
+    from clearsight.report import build_email, deliver, generate_html_report
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            pixels = synthetic_fundus(size)
+            image = Image.fromarray(pixels)
+            path = os.path.join(tmp, f"fundus_{size}.png")
+            image.save(path)
+            n = repeats if size <= 1024 else max(3, repeats // 3)
+            results[f"preprocess[{size}]"] = measure(lambda: preprocess(image), n)
+            results[f"annotation_masks[{size}]"] = measure(lambda: create_annotation_masks(path), n)
+            print(f"size {size}: done", flush=True)
+
+        if with_models:
+            from clearsight.models import load_models
+            from clearsight.preprocessing import preprocess_batch
+
+            gate, stager = load_models()
+            binary_batch, dr_batch = preprocess_batch([Image.fromarray(synthetic_fundus(512))])
+            results["gate_inference[1]"] = measure(lambda: gate.predict(binary_batch), repeats)
+            results["dr_inference[1]"] = measure(lambda: stager.predict(dr_batch), repeats)
+            binary_batch, dr_batch = np.repeat(binary_batch, 8, axis=0), np.repeat(dr_batch, 8, axis=0)
+            results["gate_inference[8]"] = measure(lambda: gate.predict(binary_batch), repeats, items=8)
+            results["dr_inference[8]"] = measure(lambda: stager.predict(dr_batch), repeats, items=8)
+
+        data, stage_info, pathologies, figures = _report_inputs()
+        report_path = os.path.join(tmp, "report.html")
+        results["html_report"] = measure(
+            lambda: generate_html_report(data, stage_info, *figures, path=report_path), repeats)
+        results["email_build"] = measure(
+            lambda: build_email("bench@localhost", "to@localhost", "Bench Patient", data, stage_info, pathologies),
+            repeats)
+        msg = build_email("bench@localhost", "to@localhost", "Bench Patient", data, stage_info, pathologies)
+        stub = smtp_stub()
+        try:
+            port = stub.server_address[1]
+            results["email_send_local"] = measure(
+                lambda: deliver(msg, "127.0.0.1", port, "bench@localhost", starttls=False), repeats)
+        finally:
+            stub.shutdown()
+    return results
+
+
+def compare(baseline, current, tolerance):
+    """Print a comparison table and return the names of regressed benchmarks"""
+    regressions = []
+    print(f"{'benchmark':<28} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    for name, now in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<28} {'-':>10} {now['p50_ms']:>10.2f} {'new':>8}")
+            continue
+        change = now["p50_ms"] / base["p50_ms"] - 1
+        flag = "  REGRESSION" if change > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<28} {base['p50_ms']:>10.2f} {now['p50_ms']:>10.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.benchmarks", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Run the suite and write JSON results")
+    run_parser.add_argument("--out", default="benchmark_results.json")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeats", type=int, default=15)
+    run_parser.add_argument("--skip-models", action="store_true", help="Skip gate and DR inference")
+    compare_parser = sub.add_parser("compare", help="Flag regressions against a stored baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed p50 slowdown (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.sizes, args.repeats, with_models=not args.skip_models)
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": results,
+        }
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        for name, r in results.items():
+            print(f"{name:<28} p50 {r['p50_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms  "
+                  f"{r['throughput_per_s']:>8.1f}/s  peak {r['peak_rss_mb']:>7.0f} MB")
+        print(f"Wrote {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.tolerance)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
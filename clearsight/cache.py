@@ -0,0 +1,129 @@
+"""Content-addressed cache of screening results.
+
+Results are keyed by a hash of the decoded RGB pixels, so re-uploading the
+same scan (even re-encoded or renamed) is a hit. Every cache is bound to a
+version: the digest of the model files it was computed with plus
+``PREPROCESS_VERSION``, so replacing a model file or changing preprocessing
+invalidates all earlier results.
+
+Rows are keyed by ``(key, version)``, so processes on different backends can
+share one database without touching each other's entries. Each open records
+that its version is in use; results of versions nobody has opened for
+``config.RESULT_CACHE_RETIRE_DAYS`` are deleted.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from clearsight import config
+from clearsight.preprocessing import PREPROCESS_VERSION
+
+
+def image_key(image):
+    """Hash of the decoded pixels (mode, size and raw bytes) of a PIL image"""
+    h = hashlib.sha256()
+    h.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def model_version(paths):
+    """Combined digest of the model files the loaded models came from and the preprocessing version"""
+    h = hashlib.sha256(f"preprocess:{PREPROCESS_VERSION}".encode())
+    for path in paths:
+        h.update(file_digest(path).encode())
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """In-memory LRU in front of an on-disk SQLite store, with hit/miss counters"""
+
+    def __init__(self, version, path=config.RESULT_CACHE_PATH, max_entries=config.RESULT_CACHE_MEMORY_ENTRIES):
+        self.version = version
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            # The old single-version table predates PREPROCESS_VERSION, so its rows are stale anyway
+            self._db.execute("DROP TABLE IF EXISTS results")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS screening_results ("
+                "key TEXT NOT NULL, version TEXT NOT NULL, "
+                "retina_prob REAL NOT NULL, stage INTEGER, confidence REAL, "
+                "PRIMARY KEY (key, version))"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS versions (version TEXT PRIMARY KEY, last_opened REAL NOT NULL)")
+            now = time.time()
+            self._db.execute("INSERT OR REPLACE INTO versions VALUES (?, ?)", (version, now))
+            retired = now - config.RESULT_CACHE_RETIRE_DAYS * 86400
+            self._db.execute(
+                "DELETE FROM screening_results WHERE version IN (SELECT version FROM versions WHERE last_opened < ?)",
+                (retired,),
+            )
+            self._db.execute("DELETE FROM versions WHERE last_opened < ?", (retired,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dict(self._memory[key])
+            row = self._db.execute(
+                "SELECT retina_prob, stage, confidence FROM screening_results WHERE key = ? AND version = ?",
+                (key, self.version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            result = {'retina_prob': row[0], 'stage': row[1], 'confidence': row[2]}
+            self._remember(key, result)
+            return dict(result)
+
+    def put(self, key, result):
+        with self._lock:
+            self._remember(key, dict(result))
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO screening_results VALUES (?, ?, ?, ?, ?)",
+                    (key, self.version, result['retina_prob'], result['stage'], result['confidence']),
+                )
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "version": self.version,
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,91 @@
+import os
+
+MODEL_DIR = os.environ.get("CLEARSIGHT_MODEL_DIR", "saved_models")
+# Download URL, SHA-256 and size of every model file (see clearsight.provision)
+MODEL_MANIFEST = os.environ.get("CLEARSIGHT_MODEL_MANIFEST",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_manifest.json"))
+# Directory or http(s) URL holding copies of the model files, tried before the manifest URLs
+MODEL_MIRROR = os.environ.get("CLEARSIGHT_MODEL_MIRROR", "")
+# Manifest entries without a sha256 are accepted after a format check while this is on. It stays
+# on until the shipped manifest is pinned; set it to 0 to refuse unpinned entries
+ALLOW_UNPINNED_MODELS = os.environ.get("CLEARSIGHT_ALLOW_UNPINNED_MODELS", "1") == "1"
+BINARY_MODEL_PATH = os.path.join(MODEL_DIR, "densenet121_retina_finetuned.pth")
+DR_MODEL_PATH = os.path.join(MODEL_DIR, "ClearSight.h5")
+
+# Images whose retina probability is below this are rejected before DR staging
+RETINA_THRESHOLD = 0.5
+
+BINARY_INPUT_SIZE = 224
+DR_INPUT_SIZE = 512
+
+# Number of images stacked into one forward pass in batch screening; a value
+# tuned by `python -m clearsight.threads autotune` is used instead unless this is set
+SCREEN_BATCH_SIZE = int(os.environ.get("CLEARSIGHT_BATCH_SIZE", "8"))
+
+DR_STAGE_NAMES = ["No DR", "Mild DR", "Moderate DR", "Severe DR", "Proliferative DR"]
+
+# Inference backend: "onnx" (ONNX Runtime for both models, the only runtime requirements.txt installs),
+# "native" (PyTorch gate + Keras DR model) or "mmap" (the same models loaded from memory-mapped
+# weights, see clearsight.weights); the last two need requirements-convert.txt
+BACKEND = os.environ.get("CLEARSIGHT_BACKEND", "onnx")
+BINARY_WEIGHTS_PATH = os.path.join(MODEL_DIR, "densenet121_retina_finetuned.safetensors")
+DR_WEIGHTS_PATH = os.path.join(MODEL_DIR, "ClearSight.safetensors")
+BINARY_ONNX_PATH = os.path.join(MODEL_DIR, "densenet121_retina_finetuned.onnx")
+DR_ONNX_PATH = os.path.join(MODEL_DIR, "ClearSight.onnx")
+# 0 uses the shared intra-op thread count (see clearsight.threads)
+ONNX_INTRA_OP_THREADS = int(os.environ.get("CLEARSIGHT_ONNX_THREADS", "0"))
+
+# Resolved against the checkout, not the working directory
+SAMPLE_IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_images")
+
+# Use the int8 retina gate built by `python -m clearsight.quantize_gate`
+QUANTIZED_GATE = os.environ.get("CLEARSIGHT_QUANTIZED_GATE", "0") == "1"
+BINARY_INT8_ONNX_PATH = os.path.join(MODEL_DIR, "densenet121_retina_finetuned.int8.onnx")
+
+# Inference result cache (see clearsight.cache)
+RESULT_CACHE = os.environ.get("CLEARSIGHT_RESULT_CACHE", "1") == "1"
+CACHE_DIR = os.environ.get("CLEARSIGHT_CACHE_DIR", os.path.join(".cache", "clearsight"))
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, "results.sqlite3")
+RESULT_CACHE_MEMORY_ENTRIES = int(os.environ.get("CLEARSIGHT_RESULT_CACHE_ENTRIES", "1024"))
+# Results of a model version no process has opened the cache with for this many days are deleted
+RESULT_CACHE_RETIRE_DAYS = float(os.environ.get("CLEARSIGHT_RESULT_CACHE_RETIRE_DAYS", "30"))
+
+# Working memory cap for lesion masks; larger images are processed in overlapping strips
+ANNOTATION_MEMORY_MB = int(os.environ.get("CLEARSIGHT_ANNOTATION_MEMORY_MB", "64"))
+# The Annotation page shows images and overlays at most this many pixels on the long side,
+# and keeps that many recent images' display layers in memory
+ANNOTATION_DISPLAY_SIZE = int(os.environ.get("CLEARSIGHT_ANNOTATION_DISPLAY_SIZE", "1024"))
+ANNOTATION_CACHE_ENTRIES = int(os.environ.get("CLEARSIGHT_ANNOTATION_CACHE_ENTRIES", "16"))
+
+# Inline image on the Results page (see clearsight.renditions): long side in pixels (2x the 590 px
+# frame for high-DPI screens), WEBP, JPEG or PNG, encoder quality, and how many recent images are kept
+RENDITION_SIZE = int(os.environ.get("CLEARSIGHT_RENDITION_SIZE", "1180"))
+RENDITION_FORMAT = os.environ.get("CLEARSIGHT_RENDITION_FORMAT", "WEBP")
+RENDITION_QUALITY = int(os.environ.get("CLEARSIGHT_RENDITION_QUALITY", "85"))
+RENDITION_CACHE_ENTRIES = int(os.environ.get("CLEARSIGHT_RENDITION_CACHE_ENTRIES", "32"))
+
+# Host thread and batch settings written by `python -m clearsight.threads autotune`
+THREAD_SETTINGS_PATH = os.path.join(CACHE_DIR, "threads.json")
+
+# Cross-session micro-batching (see clearsight.batching)
+MICROBATCH = os.environ.get("CLEARSIGHT_MICROBATCH", "1") == "1"
+MICROBATCH_MAX_ITEMS = int(os.environ.get("CLEARSIGHT_MICROBATCH_MAX_ITEMS", "16"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("CLEARSIGHT_MICROBATCH_MAX_WAIT_MS", "5"))
+
+# HTTP inference API (see clearsight.api); unset port = not started from the Streamlit pages
+API_HOST = os.environ.get("CLEARSIGHT_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("CLEARSIGHT_API_PORT", "0"))
+API_MAX_BODY_MB = int(os.environ.get("CLEARSIGHT_API_MAX_BODY_MB", "200"))
+# Prometheus scrape endpoint (GET /metrics) served from every Streamlit process; 0 disables it.
+# Local only by default; the Docker image binds it to 0.0.0.0 so the published port reaches it
+METRICS_HOST = os.environ.get("CLEARSIGHT_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("CLEARSIGHT_METRICS_PORT", "9464"))
+
+# Token for the admin page (app_pages/6_Admin.py); Dashboard.py only routes to it with ?token=...,
+# and the page is disabled while unset
+ADMIN_TOKEN = os.environ.get("CLEARSIGHT_ADMIN_TOKEN", "")
+
+# Per-rerun profiling (see clearsight.profiling)
+PROFILE = os.environ.get("CLEARSIGHT_PROFILE", "0") == "1"
+PROFILE_DIR = os.path.join(CACHE_DIR, "profiles")
+PROFILE_KEEP = int(os.environ.get("CLEARSIGHT_PROFILE_KEEP", "20"))
@@ -0,0 +1,86 @@
+"""Batch lesion-mask export for whole study folders.
+
+    python -m clearsight.export_masks <image_dir> --out <mask_dir> [--workers N]
+
+Every image under ``image_dir`` gets ``<mask_dir>/<relative path>.masks.npz``
+holding all five lesion masks bit-packed into one file (see
+``clearsight.annotation.save_masks``; read them back with ``load_masks``).
+Images run in parallel worker processes; an image whose mask file already
+exists is skipped, so an interrupted export can simply be restarted.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from clearsight import threads
+from clearsight.screen import find_images
+
+MASK_SUFFIX = ".masks.npz"
+
+
+def mask_path(out_dir, path):
+    return os.path.join(out_dir, path + MASK_SUFFIX)
+
+
+def _init_worker():
+    # Parallelism comes from the worker processes; one OpenCV thread each avoids oversubscribing
+    os.environ["CLEARSIGHT_OPENCV_THREADS"] = "1"
+
+
+def export_image(image_dir, out_dir, path):
+    """Annotate one image and write its mask file (runs in a worker process); ``(path, raw, stored, error)``"""
+    from clearsight.annotation import compute_masks, decode, save_masks
+
+    try:
+        masks = compute_masks(decode(os.path.join(image_dir, path)), workers=1)
+        target = mask_path(out_dir, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        save_masks(target, masks)
+        return path, masks.nbytes, os.path.getsize(target), None
+    except Exception as e:
+        return path, 0, 0, f"{type(e).__name__}: {e}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.export_masks", description=__doc__.splitlines()[0])
+    parser.add_argument("image_dir", help="Directory searched recursively for .jpg/.jpeg/.png images")
+    parser.add_argument("--out", required=True, help="Directory for the .masks.npz files")
+    parser.add_argument("--workers", type=int, default=threads.available_cpus(),
+                        help="Worker processes (default: the CPUs this process may use)")
+    args = parser.parse_args(argv)
+
+    paths = find_images(args.image_dir)
+    todo = [path for path in paths if not os.path.exists(mask_path(args.out, path))]
+    print(f"Found {len(paths)} images, {len(paths) - len(todo)} already exported, {len(todo)} to go")
+    if not todo:
+        return 0
+
+    raw_bytes = stored_bytes = failed = 0
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=_init_worker) as pool:
+        futures = [pool.submit(export_image, args.image_dir, args.out, path) for path in todo]
+        for done, future in enumerate(as_completed(futures), 1):
+            path, raw, stored, error = future.result()
+            if error is not None:
+                failed += 1
+                print(f"{path}: {error}", file=sys.stderr)
+            raw_bytes += raw
+            stored_bytes += stored
+            elapsed = time.perf_counter() - start
+            print(f"{done}/{len(todo)} images ({done / elapsed:.1f} img/s)", flush=True)
+
+    if stored_bytes:
+        print(f"Masks: {raw_bytes / 2 ** 20:.1f} MB as uint8, {stored_bytes / 2 ** 20:.2f} MB stored "
+              f"({raw_bytes / stored_bytes:.0f}x smaller)")
+    if failed:
+        print(f"{failed} of {len(todo)} images failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
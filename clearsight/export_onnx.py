@@ -0,0 +1,103 @@
+"""Export the retina gate and DR stage model to ONNX and check parity.
+
+    python -m clearsight.export_onnx              # export, then check on sample_images/
+    python -m clearsight.export_onnx --check-only
+
+The parity check runs every image in ``--images`` through the native and the
+ONNX backend and fails (exit code 1) if a gate decision or DR stage differs,
+or if a probability differs by more than ``--tolerance``. Without any images
+there (the Docker build has no ``sample_images/``), it runs on synthetic
+fundus images instead.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from PIL import Image
+
+from clearsight import config
+from clearsight.models import load_keras_stager, load_models, load_torch_gate
+from clearsight.pipeline import screen_images
+from clearsight.preprocessing import decode
+from clearsight.screen import find_images
+
+OPSET = 17
+
+
+def export_gate(binary_model, path=config.BINARY_ONNX_PATH):
+    """Export DenseNet121 with the softmax folded in, so the graph returns probabilities"""
+    import torch
+
+    model = torch.nn.Sequential(binary_model, torch.nn.Softmax(dim=1)).eval()
+    size = config.BINARY_INPUT_SIZE
+    torch.onnx.export(
+        model,
+        torch.zeros(1, 3, size, size),
+        path,
+        input_names=["input"],
+        output_names=["probabilities"],
+        dynamic_axes={"input": {0: "batch"}, "probabilities": {0: "batch"}},
+        opset_version=OPSET,
+    )
+
+
+def export_stager(dr_model, path=config.DR_ONNX_PATH):
+    """Export the Keras DR model (needs ``tf2onnx`` installed)"""
+    dr_model.export(path, format="onnx")
+
+
+def synthetic_images(dest, sizes=(512, 1024, 2048)):
+    """Write a few synthetic fundus images of ``sizes`` into ``dest`` and return it"""
+    from clearsight.benchmarks import synthetic_fundus
+
+    for size in sizes:
+        Image.fromarray(synthetic_fundus(size)).save(os.path.join(dest, f"fundus_{size}.png"))
+    return dest
+
+
+def check_parity(image_dir=config.SAMPLE_IMAGES_DIR, tolerance=1e-3):
+    """Return the number of images whose native and ONNX results disagree"""
+    paths = find_images(image_dir)
+    if not paths:
+        raise FileNotFoundError(f"No images found in {image_dir}")
+    # The same decode as the UI, API and CLI, so the models see the pixels production feeds them
+    images = [decode(os.path.join(image_dir, path)) for path in paths]
+    native = screen_images(*load_models("native", quantized_gate=False), images)
+    onnx = screen_images(*load_models("onnx", quantized_gate=False), images)
+
+    mismatches = 0
+    for path, a, b in zip(paths, native, onnx):
+        ok = (a['stage'] == b['stage']
+              and abs(a['retina_prob'] - b['retina_prob']) <= tolerance
+              and (a['confidence'] is None or abs(a['confidence'] - b['confidence']) <= tolerance))
+        mismatches += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {path}: native={a} onnx={b}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.export_onnx", description=__doc__.splitlines()[0])
+    parser.add_argument("--check-only", action="store_true", help="Skip the export and only run the parity check")
+    parser.add_argument("--images", default=config.SAMPLE_IMAGES_DIR, help="Images used for the parity check")
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args(argv)
+
+    if not args.check_only:
+        export_gate(load_torch_gate().model)
+        print(f"Exported: {config.BINARY_ONNX_PATH}")
+        export_stager(load_keras_stager().model)
+        print(f"Exported: {config.DR_ONNX_PATH}")
+
+    if find_images(args.images):
+        mismatches = check_parity(args.images, args.tolerance)
+    else:
+        print(f"No images in {args.images}; checking parity on synthetic fundus images")
+        with tempfile.TemporaryDirectory() as tmp:
+            mismatches = check_parity(synthetic_images(tmp), args.tolerance)
+    print(f"{mismatches} mismatching image(s)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
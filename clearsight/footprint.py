@@ -0,0 +1,79 @@
+"""Measure the cold-start cost of each inference backend.
+
+    python -m clearsight.footprint [--backends native mmap onnx] [--imports-only]
+
+Every backend is measured in a fresh interpreter: the time to import the
+serving code and its runtime, the time to load and warm up both models, the
+peak resident memory, and which deep-learning frameworks ended up imported.
+``--imports-only`` skips the model load, so it runs without the model files.
+"""
+import argparse
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import time
+
+RUNTIME_MODULES = {
+    "native": ["torch", "torchvision", "tensorflow"],
+    "mmap": ["torch", "torchvision", "tensorflow"],
+    "onnx": ["onnxruntime"],
+}
+FRAMEWORKS = ["torch", "tensorflow", "onnxruntime"]
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def probe(backend, load=True):
+    """Measure ``backend`` in the current (fresh) interpreter and print one JSON line"""
+    start = time.perf_counter()
+    from clearsight import models, pipeline  # noqa: F401
+
+    for name in RUNTIME_MODULES[backend]:
+        importlib.import_module(name)
+    import_seconds = time.perf_counter() - start
+    import_rss_mb = _peak_rss_mb()
+
+    load_seconds = None
+    if load:
+        start = time.perf_counter()
+        models.warm_up(*models.load_models(backend))
+        load_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "backend": backend,
+        "import_s": round(import_seconds, 3),
+        "load_s": None if load_seconds is None else round(load_seconds, 3),
+        "import_rss_mb": round(import_rss_mb, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "frameworks": [name for name in FRAMEWORKS if name in sys.modules],
+    }))
+
+
+def measure(backend, load=True):
+    code = f"from clearsight.footprint import probe; probe({backend!r}, load={load!r})"
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.footprint", description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(RUNTIME_MODULES), choices=list(RUNTIME_MODULES))
+    parser.add_argument("--imports-only", action="store_true", help="Skip loading the models")
+    args = parser.parse_args(argv)
+
+    print(f"{'backend':<8} {'import s':>9} {'load s':>8} {'import MB':>10} {'peak MB':>8}  frameworks")
+    for backend in args.backends:
+        r = measure(backend, load=not args.imports_only)
+        load_s = "-" if r["load_s"] is None else f"{r['load_s']:.2f}"
+        print(f"{r['backend']:<8} {r['import_s']:>9.2f} {load_s:>8} {r['import_rss_mb']:>10.0f} "
+              f"{r['peak_rss_mb']:>8.0f}  {', '.join(r['frameworks'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
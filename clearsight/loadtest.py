@@ -0,0 +1,82 @@
+"""Load test for the HTTP inference API.
+
+    python -m clearsight.api --port 8502 &
+    python -m clearsight.loadtest sample_images/0.png --concurrency 8 --requests 400
+
+Each client thread keeps one keep-alive connection open and posts the
+image(s) to ``/v1/screen`` back to back; throughput and latency
+percentiles are printed at the end.
+"""
+import argparse
+import http.client
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def client(url, payloads, count, latencies, errors):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=120)
+    for i in range(count):
+        body = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/v1/screen", body=body, headers={"Content-Type": "application/octet-stream"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=120)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="+", help="Image files to post (cycled through)")
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    args = parser.parse_args(argv)
+
+    payloads = []
+    for path in args.images:
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+
+    latencies, errors = [], []
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    threads = [threading.Thread(target=client, args=(args.url, payloads, n, latencies, errors))
+               for n in per_client]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(latencies)} ok, {len(errors)} errors in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.1f} req/s at concurrency {args.concurrency})")
+    if latencies:
+        ms = sorted(1000 * x for x in latencies)
+        print(f"latency ms: p50 {statistics.median(ms):.1f}  p95 {percentile(ms, 0.95):.1f}  "
+              f"p99 {percentile(ms, 0.99):.1f}  max {ms[-1]:.1f}")
+    if errors:
+        print(f"errors: {sorted(set(map(str, errors)))}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""In-process latency histograms and counters with Prometheus text exposition.
+
+Pages wrap each stage of a request in :func:`timed`; ``/metrics`` serves
+:func:`render` (from every Streamlit process, see
+``clearsight.api.ensure_metrics_server``, and from the HTTP API) and the
+admin page shows :func:`summary`.
+Model registry, result cache and micro-batcher state is read at scrape
+time rather than being pushed into the metrics.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+    def quantile(self, q, counts):
+        """Estimate a quantile from bucket counts by linear interpolation inside the bucket"""
+        rank = q * sum(counts)
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return 0.0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                cumulative += n
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("clearsight_stage_seconds", "Wall time spent in each request stage", ["stage"])
+STAGE_ERRORS = Counter("clearsight_stage_errors_total", "Stages that raised an exception", ["stage"])
+EVENTS = Counter("clearsight_events_total", "Outcomes of screenings, emails and feedback", ["event", "outcome"])
+METRICS = [STAGE_SECONDS, STAGE_ERRORS, EVENTS]
+
+
+@contextmanager
+def timed(stage):
+    """Record the wall time of the ``with`` block under ``stage``.
+
+    Only ``Exception`` counts as a stage error; Streamlit's rerun and stop
+    signals (and KeyboardInterrupt) end the block without being one.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def count(event, outcome):
+    EVENTS.inc(event=event, outcome=outcome)
+
+
+def _runtime_lines():
+    from clearsight.models import get_registry
+
+    registry = get_registry()
+    lines = [
+        "# HELP clearsight_model_loaded Whether the model registry has finished loading",
+        "# TYPE clearsight_model_loaded gauge",
+        f'clearsight_model_loaded{{status="{registry.status}"}} {int(registry.status == "loaded")}',
+    ]
+    if registry.result_cache is not None:
+        stats = registry.result_cache.stats()
+        lines += [
+            "# HELP clearsight_result_cache_lookups_total Result cache lookups by outcome",
+            "# TYPE clearsight_result_cache_lookups_total counter",
+            f'clearsight_result_cache_lookups_total{{outcome="memory_hit"}} {stats["memory_hits"]}',
+            f'clearsight_result_cache_lookups_total{{outcome="disk_hit"}} {stats["disk_hits"]}',
+            f'clearsight_result_cache_lookups_total{{outcome="miss"}} {stats["misses"]}',
+        ]
+    if registry.batcher is not None:
+        stats = registry.batcher.stats()
+        lines += [
+            "# HELP clearsight_microbatch_queue_depth Requests waiting for the micro-batcher",
+            "# TYPE clearsight_microbatch_queue_depth gauge",
+            f"clearsight_microbatch_queue_depth {stats['queue_depth']}",
+            "# HELP clearsight_microbatch_batches_total Batches run, by batch size",
+            "# TYPE clearsight_microbatch_batches_total counter",
+        ]
+        lines += [f'clearsight_microbatch_batches_total{{size="{size}"}} {n}'
+                  for size, n in stats["batch_size_histogram"].items()]
+        lines += [
+            "# HELP clearsight_microbatch_wait_seconds_mean Mean time a request waited for its batch",
+            "# TYPE clearsight_microbatch_wait_seconds_mean gauge",
+            f"clearsight_microbatch_wait_seconds_mean {stats['mean_wait_ms'] / 1000}",
+        ]
+    return lines
+
+
+def render():
+    """Return all metrics in the Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    lines += _runtime_lines()
+    return "\n".join(lines) + "\n"
+
+
+def summary():
+    """Return one row per stage with count, mean, estimated p50/p95 and error count"""
+    errors = {key[0]: n for key, n in STAGE_ERRORS.snapshot().items()}
+    rows = []
+    for (stage,), (counts, total, n) in sorted(STAGE_SECONDS.snapshot().items()):
+        rows.append({
+            "stage": stage,
+            "count": n,
+            "mean_ms": 1000 * total / n if n else 0.0,
+            "p50_ms": 1000 * STAGE_SECONDS.quantile(0.5, counts),
+            "p95_ms": 1000 * STAGE_SECONDS.quantile(0.95, counts),
+            "errors": errors.get(stage, 0),
+        })
+    return rows
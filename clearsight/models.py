@@ -0,0 +1,305 @@
+import os
+import threading
+import time
+
+from clearsight import config, provision, threads
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+LOADED = "loaded"
+FAILED = "failed"
+
+
+def load_binary_model(path=config.BINARY_MODEL_PATH):
+    """Build DenseNet121 with a 2-class head and load the retina gate weights"""
+    import torch
+    from torchvision import models
+
+    threads.configure_torch()
+    binary_model = models.densenet121(weights=None)  # No pretrained weights
+    num_ftrs = binary_model.classifier.in_features
+    binary_model.classifier = torch.nn.Linear(num_ftrs, 2)
+    binary_model.load_state_dict(torch.load(path, map_location=torch.device('cpu')))
+    binary_model.eval()
+    return binary_model
+
+
+def map_binary_model(path=config.BINARY_WEIGHTS_PATH):
+    """Build the retina gate with its parameters pointing straight into the mapped weight file"""
+    import torch
+    from torchvision import models
+    from clearsight.weights import map_tensors
+
+    threads.configure_torch()
+    tensors, _ = map_tensors(path)
+    # Build on the meta device so no memory is allocated or initialised for weights that are replaced anyway
+    with torch.device("meta"):
+        binary_model = models.densenet121(weights=None)
+        binary_model.classifier = torch.nn.Linear(binary_model.classifier.in_features, 2)
+    binary_model.load_state_dict({name: torch.from_numpy(a) for name, a in tensors.items()}, assign=True)
+    binary_model.eval()
+    return binary_model
+
+
+def map_dr_model(path=config.DR_WEIGHTS_PATH):
+    """Rebuild the Keras DR model from the architecture and weights in a mapped weight file"""
+    import tensorflow as tf
+    from clearsight.weights import map_tensors
+
+    threads.configure_tensorflow()
+    tensors, metadata = map_tensors(path)
+    dr_model = tf.keras.models.model_from_json(metadata["keras_model"])
+    # TensorFlow variables own their memory, so this copies once, but skips HDF5 parsing
+    dr_model.set_weights([tensors[name] for name in sorted(tensors)])
+    return dr_model
+
+
+def load_dr_model(path=config.DR_MODEL_PATH):
+    """Load the Keras DR stage model"""
+    import tensorflow as tf
+
+    threads.configure_tensorflow()
+    # Inference only: no optimizer, loss or metrics are ever needed
+    return tf.keras.models.load_model(path, compile=False)
+
+
+class TorchGate:
+    """Retina gate backed by the PyTorch DenseNet121; ``predict`` returns class probabilities"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, batch):
+        import torch
+
+        with torch.no_grad():
+            logits = self.model(torch.as_tensor(batch))
+            return torch.nn.functional.softmax(logits, dim=1).numpy()
+
+
+class KerasStager:
+    """DR stage model backed by Keras; ``predict`` returns stage probabilities.
+
+    Calls go through a traced ``tf.function`` with a fixed input signature
+    rather than ``model.predict``, which builds a tf.data pipeline and
+    callbacks on every call.
+    """
+
+    def __init__(self, model):
+        import tensorflow as tf
+
+        self.model = model
+        size = config.DR_INPUT_SIZE
+        self._serve = tf.function(
+            lambda batch: model(batch, training=False),
+            input_signature=[tf.TensorSpec((None, size, size, 3), tf.float32)],
+        )
+
+    def predict(self, batch):
+        import numpy as np
+
+        return self._serve(np.asarray(batch, dtype=np.float32)).numpy()
+
+
+class OnnxModel:
+    """Runs an exported ONNX graph on CPU with ONNX Runtime"""
+
+    def __init__(self, path):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = config.ONNX_INTRA_OP_THREADS or threads.settings()["intra_op"]
+        options.inter_op_num_threads = 1
+        options.enable_cpu_mem_arena = True
+        options.enable_mem_pattern = True
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch):
+        import numpy as np
+
+        return self.session.run(None, {self.input_name: np.asarray(batch, dtype=np.float32)})[0]
+
+
+def load_torch_gate():
+    provision.ensure(config.BINARY_MODEL_PATH)
+    return TorchGate(load_binary_model())
+
+
+def load_keras_stager():
+    provision.ensure(config.DR_MODEL_PATH)
+    return KerasStager(load_dr_model())
+
+
+def _require(path, command):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; run `{command}` first")
+
+
+def _load_onnx(path, command):
+    _require(path, command)
+    return OnnxModel(path)
+
+
+def load_mmap_gate():
+    _require(config.BINARY_WEIGHTS_PATH, "python -m clearsight.weights")
+    return TorchGate(map_binary_model())
+
+
+def load_mmap_stager():
+    _require(config.DR_WEIGHTS_PATH, "python -m clearsight.weights")
+    return KerasStager(map_dr_model())
+
+
+def load_onnx_gate():
+    return _load_onnx(config.BINARY_ONNX_PATH, "python -m clearsight.export_onnx")
+
+
+def load_onnx_stager():
+    return _load_onnx(config.DR_ONNX_PATH, "python -m clearsight.export_onnx")
+
+
+def load_int8_gate():
+    return _load_onnx(config.BINARY_INT8_ONNX_PATH, "python -m clearsight.quantize_gate")
+
+
+# (gate loader, stager loader) per backend
+BACKENDS = {
+    "native": (load_torch_gate, load_keras_stager),
+    "mmap": (load_mmap_gate, load_mmap_stager),
+    "onnx": (load_onnx_gate, load_onnx_stager),
+}
+
+
+def model_files(backend=None, quantized_gate=None):
+    """Return the ``(gate, stager)`` file paths ``load_models`` reads for these settings"""
+    backend = backend or config.BACKEND
+    if quantized_gate is None:
+        quantized_gate = config.QUANTIZED_GATE
+    gate, stager = {
+        "native": (config.BINARY_MODEL_PATH, config.DR_MODEL_PATH),
+        "mmap": (config.BINARY_WEIGHTS_PATH, config.DR_WEIGHTS_PATH),
+        "onnx": (config.BINARY_ONNX_PATH, config.DR_ONNX_PATH),
+    }[backend]
+    if quantized_gate:
+        gate = config.BINARY_INT8_ONNX_PATH
+    return gate, stager
+
+
+def load_models(backend=None, quantized_gate=None):
+    """Return ``(gate, stager)`` for the configured backend.
+
+    With ``quantized_gate`` (default: ``config.QUANTIZED_GATE``) the gate is the
+    int8 ONNX model whatever the backend; the DR model is left untouched.
+    """
+    backend = backend or config.BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {sorted(BACKENDS)}")
+    if quantized_gate is None:
+        quantized_gate = config.QUANTIZED_GATE
+    load_gate, load_stager = BACKENDS[backend]
+    if quantized_gate:
+        load_gate = load_int8_gate
+    return load_gate(), load_stager()
+
+
+def warm_up(binary_model, dr_model):
+    """Run one dummy batch through each model so the first real request is not slow"""
+    import numpy as np
+
+    size = config.BINARY_INPUT_SIZE
+    binary_model.predict(np.zeros((1, 3, size, size), dtype=np.float32))
+    size = config.DR_INPUT_SIZE
+    dr_model.predict(np.zeros((1, size, size, 3), dtype=np.float32))
+
+
+class ModelRegistry:
+    """Process-wide holder for the retina gate and the DR stage model.
+
+    Both models expose ``predict(batch)`` returning class probabilities,
+    whichever backend (see ``load_models``) they were loaded with.
+
+    Models are loaded on first use and shared by every session and page of
+    the server process. Loading is guarded by a lock so concurrent reruns
+    wait for the first load instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = NOT_LOADED
+        self._error = None
+        self.binary_model = None
+        self.dr_model = None
+        self.load_seconds = None
+        self.result_cache = None
+        self.batcher = None
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def error(self):
+        return self._error
+
+    def load(self):
+        """Download, load and warm up both models unless already done"""
+        if self._status == LOADED:
+            return self
+        with self._lock:
+            if self._status == LOADED:
+                return self
+            self._status = LOADING
+            self._error = None
+            start = time.perf_counter()
+            result_cache = batcher = None
+            try:
+                binary_model, dr_model = load_models()
+                warm_up(binary_model, dr_model)
+                if config.RESULT_CACHE:
+                    from clearsight.cache import ResultCache, model_version
+
+                    result_cache = ResultCache(model_version(model_files()))
+                if config.MICROBATCH:
+                    from clearsight.batching import MicroBatcher
+
+                    batcher = MicroBatcher(binary_model, dr_model)
+            except Exception as e:
+                # Leave the registry retryable, without a stray batcher thread or cache connection
+                if batcher is not None:
+                    batcher.close()
+                if result_cache is not None:
+                    result_cache.close()
+                self._status = FAILED
+                self._error = e
+                raise
+            self.binary_model = binary_model
+            self.dr_model = dr_model
+            self.result_cache = result_cache
+            self.batcher = batcher
+            self.load_seconds = time.perf_counter() - start
+            self._status = LOADED
+        return self
+
+    def models(self):
+        """Return ``(binary_model, dr_model)``, loading them on first call"""
+        self.load()
+        return self.binary_model, self.dr_model
+
+    def screen(self, images):
+        """Screen PIL images with the shared models, result cache and micro-batcher"""
+        from clearsight.pipeline import screen_images
+
+        self.load()
+        return screen_images(self.binary_model, self.dr_model, images,
+                             cache=self.result_cache, batcher=self.batcher)
+
+
+_registry = ModelRegistry()
+
+
+def get_registry():
+    """Return the process-wide model registry"""
+    return _registry
@@ -0,0 +1,83 @@
+import numpy as np
+
+from clearsight import config, threads
+from clearsight.cache import image_key
+from clearsight.metrics import timed
+from clearsight.preprocessing import preprocess_batch
+
+
+def batched(items, batch_size=None):
+    """Yield consecutive slices of ``items`` with at most ``batch_size`` entries (default: the host setting)"""
+    batch_size = batch_size or threads.settings()["batch_size"]
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def run_gate(binary_model, batch):
+    """Return the retina probability for each row of a preprocessed NCHW batch"""
+    return binary_model.predict(batch)[:, 1]
+
+
+def run_dr(dr_model, batch):
+    """Return ``(stages, confidences)`` arrays for a preprocessed NHWC batch"""
+    dr_pred = dr_model.predict(batch)
+    return np.argmax(dr_pred, axis=1), np.max(dr_pred, axis=1)
+
+
+def _accepted(retina_probs):
+    return [i for i, p in enumerate(retina_probs) if p >= config.RETINA_THRESHOLD]
+
+
+def _results(retina_probs, accepted, staged):
+    results = [{'retina_prob': float(p), 'stage': None, 'confidence': None} for p in retina_probs]
+    if accepted:
+        for i, stage, confidence in zip(accepted, *staged):
+            results[i]['stage'] = int(stage)
+            results[i]['confidence'] = float(confidence)
+    return results
+
+
+def screen_preprocessed(binary_model, dr_model, binary_batch, dr_batch):
+    """Gate and stage batches produced by :func:`~clearsight.preprocessing.preprocess_batch`"""
+    with timed("gate_inference"):
+        retina_probs = run_gate(binary_model, binary_batch)
+    accepted = _accepted(retina_probs)
+    staged = None
+    if accepted:
+        with timed("dr_inference"):
+            staged = run_dr(dr_model, dr_batch[accepted])
+    return _results(retina_probs, accepted, staged)
+
+
+def _screen_images(binary_model, dr_model, images, batcher=None):
+    with timed("preprocess"):
+        binary_batch, dr_batch = preprocess_batch(images)
+    if batcher is None:
+        return screen_preprocessed(binary_model, dr_model, binary_batch, dr_batch)
+    futures = [batcher.submit(b, d) for b, d in zip(binary_batch, dr_batch)]
+    return [future.result() for future in futures]
+
+
+def screen_images(binary_model, dr_model, images, cache=None, batcher=None):
+    """Run the retina gate and DR staging over one batch of images.
+
+    Images rejected by the gate are dropped before the DR batch is built.
+    Returns one dict per input image with ``retina_prob``, ``stage`` and
+    ``confidence``; ``stage`` and ``confidence`` are None for rejected images.
+    With a :class:`~clearsight.cache.ResultCache`, only images not already in
+    the cache reach the models. With a :class:`~clearsight.batching.MicroBatcher`,
+    images are preprocessed here and inference runs on the batcher's thread,
+    batched together with other sessions' requests.
+    """
+    if cache is None:
+        return _screen_images(binary_model, dr_model, images, batcher)
+
+    keys = [image_key(image) for image in images]
+    results = [cache.get(key) for key in keys]
+    todo = [i for i, result in enumerate(results) if result is None]
+    if todo:
+        fresh = _screen_images(binary_model, dr_model, [images[i] for i in todo], batcher)
+        for i, result in zip(todo, fresh):
+            cache.put(keys[i], result)
+            results[i] = result
+    return results
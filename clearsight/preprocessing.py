@@ -0,0 +1,56 @@
+import numpy as np
+from PIL import Image, ImageOps
+
+from clearsight import config
+
+# Bump whenever decode() or preprocess() output changes; cached results of older versions are then ignored
+PREPROCESS_VERSION = 2
+
+# ImageNet statistics the DenseNet gate was fine-tuned with
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def decode(source):
+    """Open an image file, path or bytes buffer as RGB for inference.
+
+    JPEGs are decoded at the smallest DCT scale that still covers the DR
+    input size, which skips most of the decode work for large camera images.
+    Every path that screens images (pages, API, CLI tools) decodes through
+    here, so the same file always gets the same model inputs and result.
+    """
+    image = Image.open(source)
+    image.draft('RGB', (config.DR_INPUT_SIZE, config.DR_INPUT_SIZE))
+    return image.convert('RGB')
+
+
+def preprocess(image):
+    """Return ``(binary_input, dr_input)`` float32 arrays for one PIL image.
+
+    Each input is built the way its model was trained: the DR input is a
+    LANCZOS centre crop fitted to 512px, the gate input a BILINEAR resize of
+    the whole frame to 224px (torchvision's ``Resize((224, 224))``), so parts
+    of the frame the crop cuts off still count towards the retina decision.
+    """
+    dr_size = (config.DR_INPUT_SIZE, config.DR_INPUT_SIZE)
+    binary_size = (config.BINARY_INPUT_SIZE, config.BINARY_INPUT_SIZE)
+    dr_image = ImageOps.fit(image, dr_size, Image.Resampling.LANCZOS)
+    binary_image = image.resize(binary_size, Image.Resampling.BILINEAR)
+
+    dr_input = np.asarray(dr_image, dtype=np.float32)
+    dr_input *= 1 / 255.0
+    binary_input = np.asarray(binary_image, dtype=np.float32)
+    binary_input *= 1 / 255.0
+    binary_input -= IMAGENET_MEAN
+    binary_input /= IMAGENET_STD
+    return binary_input.transpose(2, 0, 1), dr_input
+
+
+def preprocess_batch(images):
+    """Return ``(binary_batch, dr_batch)`` arrays (NCHW and NHWC) for a list of PIL images"""
+    n = len(images)
+    binary_batch = np.empty((n, 3, config.BINARY_INPUT_SIZE, config.BINARY_INPUT_SIZE), dtype=np.float32)
+    dr_batch = np.empty((n, config.DR_INPUT_SIZE, config.DR_INPUT_SIZE, 3), dtype=np.float32)
+    for i, image in enumerate(images):
+        binary_batch[i], dr_batch[i] = preprocess(image)
+    return binary_batch, dr_batch
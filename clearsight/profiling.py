@@ -0,0 +1,170 @@
+"""Opt-in profiling of a single page rerun.
+
+A rerun is profiled when ``CLEARSIGHT_PROFILE=1`` is set (every rerun) or
+when the page URL carries ``?profile=1&token=<CLEARSIGHT_ADMIN_TOKEN>``
+(that one rerun; the parameter is removed afterwards). Each profile gets
+its own directory under ``config.PROFILE_DIR`` with:
+
+- ``profile.pstats`` and ``summary.txt``: cProfile of the script thread
+- ``torch_trace.json``: PyTorch profiler chrome trace, if torch is loaded
+- ``tf/``: TensorFlow profiler logs for TensorBoard, if TensorFlow is loaded
+
+Only the newest ``config.PROFILE_KEEP`` directories are kept. When
+profiling is off, :func:`profile_rerun` does nothing but check two flags.
+
+cProfile (``sys.monitoring`` on Python 3.12+) and the framework profilers are
+global to the interpreter, so one profile runs at a time: a rerun that asks
+while another session is being profiled runs unprofiled, with a log note.
+"""
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import shutil
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from clearsight import config
+
+log = logging.getLogger(__name__)
+
+# Held from start to stop of the one profile that may run in this process
+_active = threading.Lock()
+
+
+def requested(query_params):
+    """Whether this rerun should be profiled"""
+    if config.PROFILE:
+        return True
+    if query_params.get("profile") != "1" or not config.ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest(query_params.get("token", ""), config.ADMIN_TOKEN)
+
+
+class Profile:
+    def __init__(self, page):
+        self.page = page
+        self.path = os.path.join(
+            config.PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{page}-{uuid.uuid4().hex[:6]}"
+        )
+        self.notes = []
+        self._cprofile = cProfile.Profile()
+        self._torch = None
+        self._tf = False
+
+    def start(self):
+        os.makedirs(self.path, exist_ok=True)
+        if "torch" in sys.modules:
+            import torch
+
+            self._torch = torch.profiler.profile(activities=[torch.profiler.ProfilerActivity.CPU])
+            self._torch.__enter__()
+        if "tensorflow" in sys.modules:
+            import tensorflow as tf
+
+            try:
+                tf.profiler.experimental.start(os.path.join(self.path, "tf"))
+                self._tf = True
+            except Exception as e:  # only one TF profiler can run per process
+                self.notes.append(f"TensorFlow profiler not started: {e}")
+        self._start = time.perf_counter()
+        self._cprofile.enable()
+
+    def abort(self):
+        """Undo a partial ``start`` without writing anything"""
+        try:
+            if self._torch is not None:
+                self._torch.__exit__(None, None, None)
+            if self._tf:
+                import tensorflow as tf
+
+                tf.profiler.experimental.stop()
+        finally:
+            _active.release()
+
+    def stop(self):
+        try:
+            self._stop()
+        finally:
+            _active.release()
+
+    def _stop(self):
+        self._cprofile.disable()
+        elapsed = time.perf_counter() - self._start
+        if self._torch is not None:
+            self._torch.__exit__(None, None, None)
+            self._torch.export_chrome_trace(os.path.join(self.path, "torch_trace.json"))
+        if self._tf:
+            import tensorflow as tf
+
+            tf.profiler.experimental.stop()
+
+        self._cprofile.dump_stats(os.path.join(self.path, "profile.pstats"))
+        out = io.StringIO()
+        out.write(f"page: {self.page}\nwall time: {elapsed:.3f}s\n")
+        for note in self.notes:
+            out.write(f"{note}\n")
+        pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(40)
+        with open(os.path.join(self.path, "summary.txt"), "w") as f:
+            f.write(out.getvalue())
+        rotate()
+
+
+def rotate(keep=None):
+    """Delete all but the newest ``keep`` profile directories"""
+    keep = config.PROFILE_KEEP if keep is None else keep
+    for path in list_profiles()[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def list_profiles():
+    """Return profile directories, newest first"""
+    if not os.path.isdir(config.PROFILE_DIR):
+        return []
+    paths = [os.path.join(config.PROFILE_DIR, name) for name in os.listdir(config.PROFILE_DIR)]
+    return sorted((p for p in paths if os.path.isdir(p)), reverse=True)
+
+
+def start_profile(page, query_params):
+    """Start and return a :class:`Profile` if :func:`requested` and none is running, else None.
+
+    For page scripts that cannot be wrapped in :func:`profile_rerun`; the
+    caller must call ``stop()`` in a ``finally`` so the profile always ends.
+    """
+    if not requested(query_params):
+        return None
+    # One-shot: the next rerun is not profiled unless asked for again
+    if not config.PROFILE and "profile" in query_params:
+        del query_params["profile"]
+    if not _active.acquire(blocking=False):
+        log.info("Not profiling %s: another profile is already running in this process", page)
+        return None
+    profile = Profile(page)
+    try:
+        profile.start()
+    except ValueError as e:  # cProfile: another profiling tool (a debugger, coverage) holds the hook
+        profile.abort()
+        log.info("Not profiling %s: %s", page, e)
+        return None
+    except BaseException:
+        profile.abort()
+        raise
+    return profile
+
+
+@contextmanager
+def profile_rerun(page, query_params):
+    """Profile the ``with`` block if :func:`requested`; otherwise run it untouched"""
+    profile = start_profile(page, query_params)
+    if profile is None:
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile.stop()
@@ -0,0 +1,309 @@
+"""Model file provisioning.
+
+    python -m clearsight.provision prefetch [--mirror DIR_OR_URL]
+    python -m clearsight.provision verify
+    python -m clearsight.provision pin [--from-disk]
+
+Model files are listed in a manifest (``config.MODEL_MANIFEST``) with their
+download URL, SHA-256 and size. ``ensure`` returns a verified local copy,
+fetching it first from the mirror (``config.MODEL_MIRROR``, a directory or an
+http(s) URL) and then from the manifest URL. Downloads go to ``<file>.part``,
+resume with a ``Range`` request after an interruption, and are renamed into
+place only once size and checksum match, so a killed download never leaves a
+file that looks complete.
+
+Every file must pass a format check for its extension (a complete zip for
+``.pth``, the HDF5 signature for ``.h5``), which catches HTML error pages and
+truncated zips. Entries without a pinned sha256 get only that check, with a
+warning, while ``CLEARSIGHT_ALLOW_UNPINNED_MODELS`` is on (the default until
+the shipped manifest is pinned). With ``CLEARSIGHT_ALLOW_UNPINNED_MODELS=0``
+they are refused (``verify`` fails, ``fetch`` raises), since an unverifiable
+file is exactly what a truncated download looks like.
+
+Run ``prefetch`` at image build time so no user session ever waits for a
+download. ``pin`` downloads every file afresh from its manifest URL and
+records its hash and size (``--from-disk`` hashes the local copies instead,
+after the format check), and ``verify`` exits 1 if any file is missing or does
+not match.
+"""
+import argparse
+import fcntl
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+
+from clearsight import config
+
+CHUNK_SIZE = 1 << 20
+
+
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+
+
+class ProvisionError(RuntimeError):
+    pass
+
+
+def _has_hdf5_signature(path):
+    with open(path, "rb") as f:
+        return f.read(len(HDF5_SIGNATURE)) == HDF5_SIGNATURE
+
+
+def _is_torch_file(path):
+    # torch.save writes a zip, whose central directory comes last, so a truncated
+    # one is caught; files from torch < 1.6 are a bare pickle and only the start is checked
+    with open(path, "rb") as f:
+        head = f.read(2)
+    return zipfile.is_zipfile(path) if head == b"PK" else head[:1] == b"\x80"
+
+
+# Structural checks by model file extension
+FORMAT_CHECKS = {
+    ".pth": _is_torch_file,
+    ".h5": _has_hdf5_signature,
+}
+
+
+def load_manifest(path=None):
+    with open(path or config.MODEL_MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return f"{st.st_size} {st.st_mtime_ns}"
+
+
+def unpinned(entry, allow_unpinned=False):
+    """True if ``entry`` cannot be verified and unpinned files are not allowed"""
+    return not entry.get("sha256") and not (allow_unpinned or config.ALLOW_UNPINNED_MODELS)
+
+
+def _matches(path, entry, allow_unpinned=False):
+    """Check ``path`` against the manifest ``entry``; ``(ok, reason)``"""
+    if unpinned(entry, allow_unpinned):
+        return False, "no sha256 pinned in the manifest"
+    size = os.path.getsize(path)
+    if entry.get("size") is not None and size != entry["size"]:
+        return False, f"size {size} != {entry['size']}"
+    check = FORMAT_CHECKS.get(os.path.splitext(path.removesuffix(".part"))[1])
+    if check is not None and not check(path):
+        return False, "not a complete model file"
+    if entry.get("sha256"):
+        digest = sha256_file(path)
+        if digest != entry["sha256"]:
+            return False, f"sha256 {digest} != {entry['sha256']}"
+    return True, ""
+
+
+def is_valid(path, entry, allow_unpinned=False):
+    """True if ``path`` exists and matches ``entry``.
+
+    A verified file gets a ``<file>.sha256`` stamp recording the hash it was
+    checked against and its size and mtime, so later starts skip re-hashing
+    until the file changes.
+    """
+    if not os.path.exists(path) or unpinned(entry, allow_unpinned):
+        return False
+    stamp_path = f"{path}.sha256"
+    expected = f"{entry.get('sha256')} {_stamp(path)}"
+    try:
+        with open(stamp_path, encoding="utf-8") as f:
+            if f.read().strip() == expected:
+                return True
+    except FileNotFoundError:
+        pass
+    ok, _ = _matches(path, entry, allow_unpinned)
+    if ok:
+        try:
+            with open(stamp_path, "w", encoding="utf-8") as f:
+                f.write(expected)
+        except OSError:
+            pass  # read-only model directory: the file is fine, it just gets re-hashed next time
+    return ok
+
+
+def sources(name, entry, mirror=None):
+    """Where to fetch ``name`` from, in order: the mirror, then the manifest URL"""
+    mirror = config.MODEL_MIRROR if mirror is None else mirror
+    if mirror:
+        if mirror.startswith(("http://", "https://")):
+            yield f"{mirror.rstrip('/')}/{urllib.parse.quote(name)}"
+        else:
+            yield os.path.join(mirror, name)
+    if entry.get("url"):
+        yield entry["url"]
+
+
+def _download(url, part, timeout):
+    """Download ``url`` into ``part``, resuming from whatever ``part`` already holds"""
+    have = os.path.getsize(part) if os.path.exists(part) else 0
+    request = urllib.request.Request(url, headers={"Range": f"bytes={have}-"} if have else {})
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and have:  # nothing left past what we already have
+            return
+        raise
+    with response:
+        if response.headers.get_content_type() == "text/html":
+            raise ProvisionError(f"{url} returned an HTML page instead of a model file")
+        # A server that ignores Range sends the whole file again
+        resumed = have and response.status == 206
+        length = response.headers.get("Content-Length")
+        expected = (have if resumed else 0) + int(length) if length else None
+        with open(part, "ab" if resumed else "wb") as f:
+            shutil.copyfileobj(response, f, CHUNK_SIZE)
+            received = f.tell()
+    if expected is not None and received < expected:
+        # Keep the partial file; the next attempt resumes from here
+        raise ProvisionError(f"connection closed after {received} of {expected} bytes")
+
+
+def _permanent(error):
+    """Errors that another attempt at the same source cannot fix (missing file, 4xx other than timeouts)"""
+    if isinstance(error, urllib.error.HTTPError):
+        return 400 <= error.code < 500 and error.code not in (408, 429)
+    return isinstance(error, FileNotFoundError)
+
+
+def fetch(name, dest_dir=None, manifest=None, mirror=None, retries=3, timeout=60, allow_unpinned=False):
+    """Make sure ``dest_dir/name`` is present and matches the manifest; return its path"""
+    manifest = manifest or load_manifest()
+    if name not in manifest:
+        raise ProvisionError(f"{name} is not in the model manifest")
+    entry = manifest[name]
+    dest_dir = dest_dir or config.MODEL_DIR
+    path = os.path.join(dest_dir, name)
+    if is_valid(path, entry, allow_unpinned):
+        return path
+
+    os.makedirs(dest_dir, exist_ok=True)
+    part = f"{path}.part"
+    # One downloader per file: other processes wait here, then find the file in place
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if is_valid(path, entry, allow_unpinned):
+            return path
+        if unpinned(entry, allow_unpinned):
+            raise ProvisionError(f"No sha256 pinned for {name}: run `python -m clearsight.provision pin` and commit "
+                                 "the manifest, or drop CLEARSIGHT_ALLOW_UNPINNED_MODELS=0 to accept files on a "
+                                 "format check alone")
+        if not entry.get("sha256"):
+            print(f"Warning: no sha256 pinned for {name}; only its format is checked", file=sys.stderr)
+
+        errors = []
+        for source in sources(name, entry, mirror):
+            for attempt in range(retries):
+                try:
+                    if source.startswith(("http://", "https://")):
+                        _download(source, part, timeout)
+                    else:
+                        shutil.copyfile(source, part)
+                except (OSError, http.client.HTTPException, ProvisionError) as e:
+                    errors.append(f"{source}: {e}")
+                    if _permanent(e):
+                        break  # e.g. the mirror does not have this file; go to the next source
+                    if attempt + 1 < retries:
+                        time.sleep(min(2 ** attempt, 30))
+                    continue
+
+                ok, reason = _matches(part, entry, allow_unpinned)
+                if ok:
+                    os.replace(part, path)
+                    is_valid(path, entry, allow_unpinned)  # write the stamp
+                    print(f"Fetched {name} from {source}")
+                    return path
+                # A corrupt or overlong file cannot be resumed; start again from scratch
+                os.remove(part)
+                errors.append(f"{source}: {reason}")
+    raise ProvisionError(f"Could not fetch {name}:\n  " + "\n  ".join(errors))
+
+
+def ensure(path, **kwargs):
+    """``fetch`` addressed by local path, e.g. ``ensure(config.BINARY_MODEL_PATH)``"""
+    return fetch(os.path.basename(path), os.path.dirname(path) or ".", **kwargs)
+
+
+def pin(dest_dir=None, manifest_path=None, from_disk=False):
+    """Record the sha256 and size of every model file in the manifest.
+
+    Files are downloaded afresh from their manifest URLs (never the mirror)
+    into a temporary directory, so what gets pinned is what the source
+    serves. With ``from_disk`` the copies in ``dest_dir`` are hashed instead.
+    Either way a file must pass its format check first.
+    """
+    manifest_path = manifest_path or config.MODEL_MANIFEST
+    manifest = load_manifest(manifest_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, entry in manifest.items():
+            if from_disk:
+                path = os.path.join(dest_dir or config.MODEL_DIR, name)
+                if not os.path.exists(path):
+                    raise ProvisionError(f"{path} does not exist")
+            else:
+                path = fetch(name, tmp, {name: {"url": entry.get("url")}}, mirror="", allow_unpinned=True)
+            check = FORMAT_CHECKS.get(os.path.splitext(name)[1])
+            if check is not None and not check(path):
+                raise ProvisionError(f"{path} is not a complete model file; refusing to pin it")
+            entry["sha256"] = sha256_file(path)
+            entry["size"] = os.path.getsize(path)
+            print(f"{name}: {entry['sha256']} ({entry['size']} bytes)")
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, manifest_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.provision", description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", default=None, help=f"default {config.MODEL_MANIFEST}")
+    parser.add_argument("--dest", default=None, help=f"model directory (default {config.MODEL_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    prefetch = commands.add_parser("prefetch", help="download every model file that is missing or invalid")
+    prefetch.add_argument("names", nargs="*", help="only these files (default: all)")
+    prefetch.add_argument("--mirror", default=None, help="directory or http(s) URL tried first")
+    prefetch.add_argument("--retries", type=int, default=3)
+    commands.add_parser("verify", help="exit 1 if any model file is missing or does not match")
+    pin_parser = commands.add_parser("pin", help="download every file afresh and write its hash and size into the manifest")
+    pin_parser.add_argument("--from-disk", action="store_true", help="hash the local files instead of downloading")
+    args = parser.parse_args(argv)
+
+    if args.command == "pin":
+        pin(args.dest, args.manifest, args.from_disk)
+        return 0
+
+    manifest = load_manifest(args.manifest)
+    dest_dir = args.dest or config.MODEL_DIR
+    if args.command == "verify":
+        bad = [name for name, entry in manifest.items() if not is_valid(os.path.join(dest_dir, name), entry)]
+        for name in bad:
+            reason = "no sha256 pinned" if unpinned(manifest[name]) else "missing or invalid"
+            print(f"{name}: {reason}", file=sys.stderr)
+        return 1 if bad else 0
+
+    for name in args.names or manifest:
+        fetch(name, dest_dir, manifest, mirror=args.mirror, retries=args.retries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
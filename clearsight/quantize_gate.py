@@ -0,0 +1,111 @@
+"""Build the int8 retina gate and report how well it agrees with the float gate.
+
+    python -m clearsight.quantize_gate path/to/labeled_dir
+    python -m clearsight.quantize_gate path/to/labeled_dir --report-only
+
+``labeled_dir`` must contain ``retina/`` and ``non_retina/`` subfolders. The
+int8 model is produced with ONNX Runtime dynamic quantization from the float
+ONNX gate (see ``clearsight.export_onnx``) and saved next to it. Enable it
+with ``CLEARSIGHT_QUANTIZED_GATE=1``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from clearsight import config
+from clearsight.models import OnnxModel
+from clearsight.pipeline import batched
+from clearsight.preprocessing import decode, preprocess_batch
+from clearsight.screen import find_images
+
+LABELS = {"retina": 1, "non_retina": 0}
+
+
+def quantize(src=config.BINARY_ONNX_PATH, dst=config.BINARY_INT8_ONNX_PATH):
+    """Write an int8 copy of the float ONNX gate (weights quantized, activations dynamic)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    # ConvInteger kernels in ONNX Runtime only accept unsigned 8-bit weights
+    quantize_dynamic(src, dst, weight_type=QuantType.QUInt8)
+
+
+def load_labeled(image_dir):
+    """Return ``(paths, labels)`` for every image in the known label folders"""
+    paths, labels = [], []
+    for folder, label in LABELS.items():
+        for path in find_images(os.path.join(image_dir, folder)):
+            paths.append(os.path.join(image_dir, folder, path))
+            labels.append(label)
+    if not paths:
+        raise FileNotFoundError(f"No images found under {image_dir}/{{{','.join(LABELS)}}}")
+    return paths, np.array(labels)
+
+
+def run_gate_timed(gate, batches):
+    probs, elapsed = [], 0.0
+    for batch in batches:
+        start = time.perf_counter()
+        probs.append(gate.predict(batch)[:, 1])
+        elapsed += time.perf_counter() - start
+    return np.concatenate(probs), elapsed
+
+
+def agreement_report(image_dir):
+    """Compare the float and int8 gates on a labeled folder"""
+    paths, labels = load_labeled(image_dir)
+    batches = [preprocess_batch([decode(p) for p in chunk])[0] for chunk in batched(paths)]
+
+    float_gate = OnnxModel(config.BINARY_ONNX_PATH)
+    int8_gate = OnnxModel(config.BINARY_INT8_ONNX_PATH)
+    for gate in (float_gate, int8_gate):
+        gate.predict(batches[0])  # warm-up
+    float_probs, float_s = run_gate_timed(float_gate, batches)
+    int8_probs, int8_s = run_gate_timed(int8_gate, batches)
+
+    float_pred = float_probs >= config.RETINA_THRESHOLD
+    int8_pred = int8_probs >= config.RETINA_THRESHOLD
+    n = len(paths)
+    return {
+        "images": n,
+        "decision_agreement": float(np.mean(float_pred == int8_pred)),
+        "disagreements": [p for p, a, b in zip(paths, float_pred, int8_pred) if a != b],
+        "float_accuracy": float(np.mean(float_pred == labels)),
+        "int8_accuracy": float(np.mean(int8_pred == labels)),
+        "max_prob_diff": float(np.max(np.abs(float_probs - int8_probs))),
+        "mean_prob_diff": float(np.mean(np.abs(float_probs - int8_probs))),
+        "float_ms_per_image": 1000 * float_s / n,
+        "int8_ms_per_image": 1000 * int8_s / n,
+        "float_model_mb": os.path.getsize(config.BINARY_ONNX_PATH) / 2**20,
+        "int8_model_mb": os.path.getsize(config.BINARY_INT8_ONNX_PATH) / 2**20,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.quantize_gate", description=__doc__.splitlines()[0])
+    parser.add_argument("image_dir", help="Folder with retina/ and non_retina/ subfolders")
+    parser.add_argument("--report-only", action="store_true", help="Reuse the existing int8 model")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if not args.report_only:
+        quantize()
+        print(f"Quantized: {config.BINARY_INT8_ONNX_PATH}")
+
+    report = agreement_report(args.image_dir)
+    for key, value in report.items():
+        if key != "disagreements":
+            print(f"{key:>20}: {value:.4f}" if isinstance(value, float) else f"{key:>20}: {value}")
+    for path in report["disagreements"]:
+        print(f"  disagrees: {path}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
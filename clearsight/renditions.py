@@ -0,0 +1,122 @@
+"""Display-size renditions of uploaded fundus images for inline ``<img>`` tags.
+
+    python -m clearsight.renditions [image ...] [--sizes 2048 4096]
+
+The Results Analysis page used to decode the stored upload and re-encode it
+as a full-resolution PNG data URI on every rerun. ``data_uri`` instead scales
+the image to ``config.RENDITION_SIZE`` on the long side, encodes it once as
+``config.RENDITION_FORMAT`` (WebP, or JPEG where Pillow lacks WebP), and keeps
+the finished URI by a hash of the original bytes, so reruns cost a dictionary
+lookup. The command prints the inline payload of the old and new paths for
+the given images, or for synthetic fundus images of ``--sizes``.
+"""
+import argparse
+import base64
+import hashlib
+import io
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image, features
+
+from clearsight import config
+from clearsight.metrics import count, timed
+
+MIME_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg", "PNG": "image/png"}
+
+_uris = OrderedDict()
+_uris_lock = threading.Lock()
+
+
+def output_format(fmt=None):
+    fmt = (fmt or config.RENDITION_FORMAT).upper()
+    if fmt not in MIME_TYPES:
+        raise ValueError(f"Unknown rendition format {fmt!r}; expected one of {sorted(MIME_TYPES)}")
+    if fmt == "WEBP" and not features.check("webp"):
+        return "JPEG"
+    return fmt
+
+
+def rendition(data, size=None, fmt=None, quality=None):
+    """Encoded bytes of image ``data`` scaled to fit ``size`` px on the long side"""
+    size = size or config.RENDITION_SIZE
+    fmt = output_format(fmt)
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (size, size))  # JPEG uploads decode at a reduced scale directly
+    image = image.convert("RGB")
+    image.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+    out = io.BytesIO()
+    image.save(out, format=fmt, quality=quality or config.RENDITION_QUALITY)
+    return out.getvalue()
+
+
+def data_uri(data, size=None, fmt=None, quality=None):
+    """``data:`` URI of ``rendition(data, ...)``, built once per distinct image content and settings"""
+    key = (hashlib.sha256(data).hexdigest(), size, fmt, quality)
+    with _uris_lock:
+        uri = _uris.get(key)
+        if uri is not None:
+            _uris.move_to_end(key)
+    if uri is not None:
+        count("rendition_cache", "hit")
+        return uri
+
+    count("rendition_cache", "miss")
+    with timed("rendition"):
+        encoded = rendition(data, size, fmt, quality)
+    uri = f"data:{MIME_TYPES[output_format(fmt)]};base64,{base64.b64encode(encoded).decode()}"
+    with _uris_lock:
+        _uris[key] = uri
+        while len(_uris) > config.RENDITION_CACHE_ENTRIES:
+            _uris.popitem(last=False)
+    return uri
+
+
+def legacy_data_uri(data):
+    """What the Results page used to inline: the full image re-encoded as PNG"""
+    buffered = io.BytesIO()
+    Image.open(io.BytesIO(data)).save(buffered, format="PNG")
+    return f"data:image/png;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+
+
+def _ms(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.renditions", description=__doc__.splitlines()[0])
+    parser.add_argument("images", nargs="*", help="Image files to measure (default: synthetic fundus images)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2048, 4096],
+                        help="Synthetic image sizes when no images are given")
+    args = parser.parse_args(argv)
+
+    inputs = []
+    for path in args.images:
+        with open(path, "rb") as f:
+            inputs.append((path, f.read()))
+    if not inputs:
+        from clearsight.benchmarks import synthetic_fundus
+
+        for size in args.sizes:
+            out = io.BytesIO()
+            Image.fromarray(synthetic_fundus(size)).save(out, format="JPEG", quality=92)
+            inputs.append((f"synthetic {size}px JPEG", out.getvalue()))
+
+    print(f"Rendition: {output_format()} at {config.RENDITION_SIZE} px, quality {config.RENDITION_QUALITY}")
+    print(f"{'image':<24} {'upload KB':>10} {'before KB':>10} {'after KB':>10} {'before ms':>10} "
+          f"{'first ms':>10} {'cached ms':>10}")
+    for name, data in inputs:
+        before_ms = _ms(legacy_data_uri, data)
+        first_ms = _ms(data_uri, data)
+        cached_ms = _ms(data_uri, data)
+        print(f"{name[-24:]:<24} {len(data) / 1024:>10.0f} {len(legacy_data_uri(data)) / 1024:>10.0f} "
+              f"{len(data_uri(data)) / 1024:>10.0f} {before_ms:>10.0f} {first_ms:>10.0f} {cached_ms:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
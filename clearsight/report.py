@@ -0,0 +1,182 @@
+"""HTML report and email construction for the Results Analysis page"""
+import smtplib
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from zoneinfo import ZoneInfo
+
+
+def generate_html_report(data, stage_info, fig_radar, fig_bars, fig_progression, path="temp_report.html"):
+    """Generate HTML report with interactive charts"""
+    report_html = f"""
+    <html>
+    <head>
+        <title>ClearSight.AI Full Report</title>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 1200px; margin: 0 auto; }}
+            .header {{ background-color: {stage_info[1]}; padding: 20px; color: white; text-align: center; }}
+            .section {{ margin: 30px 0; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+            img {{ max-width: 100%; height: auto; }}
+            .chart-container {{ margin: 20px 0; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>ClearSight.AI Diabetic Retinopathy Report</h1>
+            <h3>{datetime.now(ZoneInfo("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M')}</h3>
+        </div>
+
+        <div class="section">
+            <h2>Diagnosis Summary</h2>
+            <div style="border-left: 4px solid {stage_info[1]}; padding-left: 15px;">
+                <h3 style="color: {stage_info[1]};">{stage_info[0]}</h3>
+                <p><strong>Confidence Level:</strong> {data['confidence']*100:.1f}%</p>
+                <p><strong>Image Quality Score:</strong> {data['retina_prob']*100:.1f}%</p>
+                <p>{stage_info[3]}</p>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>Pathological Features Analysis</h2>
+            <div class="chart-container">
+                {fig_radar.to_html(full_html=False, include_plotlyjs='cdn')}
+            </div>
+            <div class="chart-container">
+                {fig_bars.to_html(full_html=False, include_plotlyjs='cdn')}
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>Historical Progression Prediction</h2>
+            {fig_progression.to_html(full_html=False, include_plotlyjs='cdn')}
+            <p><em>* Simulated prediction based on current diagnosis</em></p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    # Save report to temporary file
+    with open(path, "w") as f:
+        f.write(report_html)
+    
+    return report_html
+
+
+def get_clinical_notes(stage):
+    """Return stage-specific clinical recommendations"""
+    notes = {
+        0: "Recommend annual retinal screening. Maintain good glycemic control (HbA1c < 7%). Regular monitoring of blood pressure and lipid profile.",
+        1: "6-month follow-up recommended. Optimize blood glucose management. Consider focal laser therapy if microaneurysms progress.",
+        2: "3-month ophthalmologist review required. Evaluate for macular edema. Anti-VEGF therapy may be indicated.",
+        3: "Urgent referral to retinal specialist. Pan-retinal photocoagulation likely needed. Monitor for vitreous hemorrhage.",
+        4: "Emergency intervention required. High risk of vision loss. Vitrectomy may be necessary. Intensive glycemic control critical."
+    }
+    return notes.get(stage, "Consult ophthalmologist for further evaluation.")
+
+
+def build_email(sender, receiver_email, patient_name, diagnosis_data, stage_info, pathologies):
+    """Build the professional medical report email; ``pathologies`` maps feature names to ``lesion_metrics`` entries"""
+    # Create HTML email body
+    html_content = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; max-width: 600px; margin: 0 auto;">
+        <div style="background-color: {stage_info[1]}; padding: 20px; color: white; text-align: center;">
+            <h1>ClearSight.AI Diabetic Retinopathy Report</h1>
+            <h3>{datetime.now(ZoneInfo("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M')}</h3>
+        </div>
+
+        <div style="padding: 20px;">
+            <!-- Diagnosis Summary -->
+            <div style="margin-bottom: 25px; border-left: 4px solid {stage_info[1]}; padding-left: 15px;">
+                <h2 style="color: {stage_info[1]};">Diagnosis Summary</h2>
+                <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px;">
+                    <div>
+                        <h3 style="margin: 0;">Stage</h3>
+                        <p style="font-size: 1.2em; margin: 5px 0;">{stage_info[0]}</p>
+                    </div>
+                    <div>
+                        <h3 style="margin: 0;">Confidence</h3>
+                        <p style="font-size: 1.2em; margin: 5px 0;">{diagnosis_data['confidence']*100:.1f}%</p>
+                    </div>
+                    <div>
+                        <h3 style="margin: 0;">Image Quality</h3>
+                        <p style="font-size: 1.2em; margin: 5px 0;">{diagnosis_data['retina_prob']*100:.1f}%</p>
+                    </div>
+                    <div>
+                        <h3 style="margin: 0;">Severity Level</h3>
+                        <p style="font-size: 1.2em; margin: 5px 0;">{stage_info[2]} {stage_info[3]}</p>
+                    </div>
+                </div>
+            </div>
+
+            <!-- Key Findings -->
+            <div style="margin: 25px 0;">
+                <h2 style="color: {stage_info[1]};">Pathological Features</h2>
+                <table style="width: 100%; border-collapse: collapse;">
+                    <tr style="background-color: #f8f9fa;">
+                        <th style="padding: 10px; text-align: left;">Feature</th>
+                        <th style="padding: 10px; text-align: right;">Lesions</th>
+                        <th style="padding: 10px; text-align: right;">Affected Area</th>
+                    </tr>
+                    {"".join([
+                        f'<tr><td style="padding: 8px; border-bottom: 1px solid #eee;">{k}</td>'
+                        f'<td style="padding: 8px; border-bottom: 1px solid #eee; text-align: right;">{v["count"]}</td>'
+                        f'<td style="padding: 8px; border-bottom: 1px solid #eee; text-align: right;">{v["area_fraction"]*100:.2f}%</td></tr>'
+                        for k, v in pathologies.items()
+                    ])}
+                </table>
+            </div>
+
+            <!-- Recommendations -->
+            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
+                <h2 style="color: {stage_info[1]};">Clinical Recommendations</h2>
+                <p>{get_clinical_notes(diagnosis_data['stage'])}</p>
+            </div>
+
+            <!-- Footer -->
+            <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #eee; color: #666;">
+                <p>This report was generated automatically by ClearSight.AI systems</p>
+                <p>This is not a medical diagnosis - Consult your ophthalmologist</p>
+                <p>Contact: hardikchhipa28@gmail.com | © 2024 ClearSight Analytics</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    # Plain text version
+    text_content = f"""Diabetic Retinopathy Analysis Report
+-----------------------------------------
+Patient: {patient_name}
+Date: {datetime.now(ZoneInfo("Asia/Kolkata")).strftime('%Y-%m-%d %H:%M')}
+
+Diagnosis Summary:
+- Stage: {stage_info[0]}
+- Confidence: {diagnosis_data['confidence']*100:.1f}%
+- Image Quality: {diagnosis_data['retina_prob']*100:.1f}%
+- Key Features: {', '.join([f'{k} ({v["count"]} lesions, {v["area_fraction"]*100:.2f}% of image)' for k,v in pathologies.items()])}
+
+Recommendations:
+{get_clinical_notes(diagnosis_data['stage'])}
+
+This report is generated automatically - Consult your ophthalmologist
+"""
+
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = f"Diabetic Retinopathy Analysis - {patient_name}"
+    msg['From'] = sender
+    msg['To'] = receiver_email
+
+    msg.attach(MIMEText(text_content, 'plain'))
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+
+def deliver(msg, server, port, sender, password=None, starttls=True):
+    """Send a built email over SMTP"""
+    with smtplib.SMTP(server, port) as smtp:
+        if starttls:
+            smtp.starttls()
+        if password:
+            smtp.login(sender, password)
+        smtp.sendmail(sender, msg['To'], msg.as_string())
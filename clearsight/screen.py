@@ -0,0 +1,218 @@
+"""Headless batch screener for directories of fundus images.
+
+    python -m clearsight.screen <image_dir> --out results.parquet
+
+Images are decoded and preprocessed in a pool of worker processes while the
+main process runs batched gate + DR inference. Results are written after
+every batch, either appended to a CSV file or as part files inside a Parquet
+dataset directory, and a rerun with the same ``--out`` skips images that
+already have a result, so an interrupted run can simply be restarted. Images
+that failed (``error`` set) are tried again on the rerun; their new row is
+appended after the old one, so the last row for a path is the current one.
+"""
+import argparse
+import csv
+import glob
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from clearsight import config, threads
+from clearsight.pipeline import batched, screen_preprocessed
+from clearsight.preprocessing import decode, preprocess
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+COLUMNS = ["path", "retina_prob", "accepted", "stage", "stage_name", "confidence", "error"]
+PART_NAME = re.compile(r"part-(\d+)\.parquet")
+
+
+def find_images(image_dir):
+    """Return image paths under ``image_dir``, relative to it and sorted"""
+    paths = []
+    for root, _, files in os.walk(image_dir):
+        for name in files:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.relpath(os.path.join(root, name), image_dir))
+    return sorted(paths)
+
+
+def load_image(image_dir, path):
+    """Decode and preprocess one image (runs in a worker process)"""
+    try:
+        binary_input, dr_input = preprocess(decode(os.path.join(image_dir, path)))
+        return path, binary_input, dr_input, None
+    except Exception as e:
+        return path, None, None, f"{type(e).__name__}: {e}"
+
+
+class CsvResultWriter:
+    """Appends result rows to a CSV file, one flush per batch"""
+
+    def __init__(self, path):
+        self.path = path
+        self._repair_tail()
+
+    def _repair_tail(self):
+        # A crash can leave a half-written last line; cut it so appends stay aligned
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def done_paths(self):
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, newline="") as f:
+            return {row["path"] for row in csv.DictReader(f) if not row["error"]}
+
+    def write(self, rows):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+
+class ParquetResultWriter:
+    """Writes each batch as a ``part-NNNNNN.parquet`` file inside the ``--out`` directory.
+
+    Part files are written to a temporary name and renamed into place, so a
+    crash never leaves a truncated part behind. ``pandas.read_parquet`` and
+    ``pyarrow.dataset`` read the directory as a single table.
+    """
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.path = path
+        self.schema = pa.schema([
+            ("path", pa.string()),
+            ("retina_prob", pa.float64()),
+            ("accepted", pa.bool_()),
+            ("stage", pa.int64()),
+            ("stage_name", pa.string()),
+            ("confidence", pa.float64()),
+            ("error", pa.string()),
+        ])
+        os.makedirs(path, exist_ok=True)
+        # One past the highest existing number, so a gap left by a deleted part never reuses a name
+        matches = (PART_NAME.fullmatch(os.path.basename(part)) for part in self._parts())
+        self._next_part = max((int(m.group(1)) for m in matches if m), default=-1) + 1
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def done_paths(self):
+        import pyarrow.parquet as pq
+
+        done = set()
+        for part in self._parts():
+            table = pq.read_table(part, columns=["path", "error"]).to_pydict()
+            done.update(path for path, error in zip(table["path"], table["error"]) if not error)
+        return done
+
+    def write(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        final_path = os.path.join(self.path, f"part-{self._next_part:06d}.parquet")
+        tmp_path = final_path + ".tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, final_path)
+        self._next_part += 1
+
+
+def open_writer(out):
+    if out.lower().endswith(".csv"):
+        return CsvResultWriter(out)
+    if out.lower().endswith(".parquet"):
+        return ParquetResultWriter(out)
+    raise ValueError(f"Unsupported output format: {out} (use .csv or .parquet)")
+
+
+def iter_batches(pool, image_dir, paths, batch_size, prefetch):
+    """Yield preprocessed batches in order, keeping ``prefetch`` batches in flight"""
+    pending = deque()
+    for chunk in batched(paths, batch_size):
+        pending.append([pool.submit(load_image, image_dir, path) for path in chunk])
+        if len(pending) > prefetch:
+            yield [future.result() for future in pending.popleft()]
+    while pending:
+        yield [future.result() for future in pending.popleft()]
+
+
+def screen_batch(binary_model, dr_model, loaded):
+    """Turn one batch of ``load_image`` results into output rows"""
+    rows = []
+    ok = [item for item in loaded if item[3] is None]
+    for path, _, _, error in loaded:
+        if error is not None:
+            rows.append(dict.fromkeys(COLUMNS) | {"path": path, "accepted": False, "error": error})
+    if ok:
+        binary_batch = np.stack([item[1] for item in ok])
+        dr_batch = np.stack([item[2] for item in ok])
+        results = screen_preprocessed(binary_model, dr_model, binary_batch, dr_batch)
+        for (path, *_), result in zip(ok, results):
+            stage = result['stage']
+            rows.append({
+                "path": path,
+                "retina_prob": result['retina_prob'],
+                "accepted": stage is not None,
+                "stage": stage,
+                "stage_name": config.DR_STAGE_NAMES[stage] if stage is not None else None,
+                "confidence": result['confidence'],
+                "error": None,
+            })
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.screen", description=__doc__.splitlines()[0])
+    parser.add_argument("image_dir", help="Directory searched recursively for .jpg/.jpeg/.png images")
+    parser.add_argument("--out", required=True, help="Output file, .csv or .parquet")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="images per forward pass (default: the tuned or configured host setting)")
+    parser.add_argument("--workers", type=int, default=threads.available_cpus(),
+                        help="Decode/preprocess worker processes (default: the CPUs this process may use)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    writer = open_writer(args.out)
+    paths = find_images(args.image_dir)
+    done = writer.done_paths()
+    todo = [path for path in paths if path not in done]
+    print(f"Found {len(paths)} images, {len(done)} already screened, {len(todo)} to go")
+    if not todo:
+        return 0
+
+    # Spawned workers never inherit the model runtimes' thread pools or locks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        from clearsight.models import load_models
+
+        # No micro-batcher or result cache: every image is new and batches are already full
+        binary_model, dr_model = load_models()
+        start = time.perf_counter()
+        screened = 0
+        for loaded in iter_batches(pool, args.image_dir, todo, args.batch_size, prefetch=max(2, args.workers)):
+            writer.write(screen_batch(binary_model, dr_model, loaded))
+            screened += len(loaded)
+            elapsed = time.perf_counter() - start
+            print(f"{screened}/{len(todo)} images ({screened / elapsed:.1f} img/s)", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
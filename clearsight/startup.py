@@ -0,0 +1,93 @@
+"""Measure the cold import cost of each Streamlit page.
+
+    python -m clearsight.startup [--repeats 3] [--budget-ms 1500]
+
+Every page's module-level imports are executed in a fresh interpreter, so the
+number is what a cold server pays before the page can draw anything. The
+Dashboard is checked against ``--budget-ms`` and the command exits non-zero
+when it goes over; ``tests/test_startup.py`` asserts the same budget.
+
+Only the top-level ``import`` statements are run, not the page itself.
+Imports inside functions or branches are left out, which is where heavy
+dependencies belong, but that also means an import inside a function the page
+calls unconditionally on load is not measured. Keep such imports out of the
+unconditional load path, or measure the page with a real Streamlit run.
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_PAGE = "Dashboard.py"
+HEAVY_MODULES = ["torch", "torchvision", "tensorflow", "onnxruntime", "cv2", "pandas",
+                 "plotly", "firebase_admin", "numpy"]
+DEFAULT_BUDGET_MS = 1500.0
+
+
+def pages():
+    return [ENTRY_PAGE] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "app_pages", "*.py")))
+
+
+def top_level_imports(path):
+    """Source of the import statements a page runs unconditionally when it is loaded"""
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def probe(path):
+    """Run ``path``'s top-level imports in the current (fresh) interpreter and print one JSON line"""
+    import time
+
+    code = compile(top_level_imports(path), path, "exec")
+    start = time.perf_counter()
+    exec(code, {"__name__": "__startup_probe__"})
+    import_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({
+        "page": path,
+        "import_ms": round(import_ms, 1),
+        "heavy": [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def measure(path, repeats=3):
+    """Best of ``repeats`` cold runs, each in its own interpreter"""
+    code = f"from clearsight.startup import probe; probe({path!r})"
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return min(runs, key=lambda r: r["import_ms"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.startup", description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"cold import budget for {ENTRY_PAGE} (default {DEFAULT_BUDGET_MS:.0f})")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [measure(path, args.repeats) for path in pages()]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'page':<30} {'import ms':>10}  heavy modules")
+        for r in results:
+            print(f"{r['page']:<30} {r['import_ms']:>10.0f}  {', '.join(r['heavy']) or '-'}")
+
+    entry = next(r for r in results if r["page"] == ENTRY_PAGE)
+    if entry["import_ms"] > args.budget_ms:
+        print(f"{ENTRY_PAGE} imports in {entry['import_ms']:.0f} ms, over the {args.budget_ms:.0f} ms budget",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""CPU thread settings shared by PyTorch, TensorFlow, ONNX Runtime and OpenCV.
+
+    python -m clearsight.threads                  # show the effective settings
+    python -m clearsight.threads autotune         # sweep on the real models and persist the fastest
+
+Left alone, PyTorch and TensorFlow each size their thread pools to every core
+of the host, not to the container's CPU quota, and OpenCV adds a third pool on
+top. ``settings`` starts from the CPUs this process may actually use (cgroup
+quota and affinity) and splits them with ``budget``: OpenCV gets
+``OPENCV_SHARE`` of them and the model runtimes the rest (on a single CPU,
+OpenCV runs on the calling thread instead). The gate and the DR model run one
+after the other within a request, so PyTorch and TensorFlow (or the two ONNX
+Runtime sessions) take turns on the model share instead of each getting their
+own. What ``autotune`` persisted is overlaid next, provided it was tuned for
+the same CPU count and backend, then ``CLEARSIGHT_*`` environment overrides.
+The ``configure_*`` functions apply the result right after each framework is
+imported.
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+from clearsight import config
+
+ENV_OVERRIDES = {
+    "intra_op": "CLEARSIGHT_INTRA_OP_THREADS",
+    "inter_op": "CLEARSIGHT_INTER_OP_THREADS",
+    "opencv": "CLEARSIGHT_OPENCV_THREADS",
+    "batch_size": "CLEARSIGHT_BATCH_SIZE",
+}
+AUTOTUNE_BATCH_SIZES = [1, 4, 8, 16]
+# Fraction of the CPUs left to OpenCV (annotation filters, mask export); the model runtimes get the rest
+OPENCV_SHARE = 0.25
+
+_settings = None
+
+
+def cpu_quota():
+    """CPUs allowed by the cgroup CPU quota, or None when unlimited"""
+    try:  # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:  # cgroup v1: quota is -1 when unlimited
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """CPUs this process can actually run on: affinity mask capped by the cgroup quota"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def budget(cpus=None):
+    """Split ``cpus`` (default: ``available_cpus()``) into ``(model runtime threads, OpenCV threads)``"""
+    cpus = cpus or available_cpus()
+    if cpus == 1:
+        # cv2.setNumThreads(0) runs OpenCV on the calling thread, so it shares the one CPU with the models
+        return 1, 0
+    opencv = max(1, int(cpus * OPENCV_SHARE))
+    return cpus - opencv, opencv
+
+
+def defaults():
+    intra_op, opencv = budget()
+    return {"intra_op": intra_op, "inter_op": 1, "opencv": opencv, "batch_size": config.SCREEN_BATCH_SIZE}
+
+
+def load(path=None):
+    """Settings persisted by ``autotune``, or ``{}``"""
+    try:
+        with open(path or config.THREAD_SETTINGS_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def tuned():
+    """What ``autotune`` persisted, or ``{}`` if it was tuned for another CPU count or backend"""
+    saved = load()
+    if not saved:
+        return {}
+    cpus, backend = available_cpus(), config.BACKEND
+    if saved.get("cpus") != cpus or saved.get("backend") != backend:
+        print(f"Ignoring {config.THREAD_SETTINGS_PATH}: tuned for {saved.get('cpus')} CPUs on the "
+              f"{saved.get('backend')} backend, this process has {cpus} on {backend}; "
+              f"rerun `python -m clearsight.threads autotune`", file=sys.stderr)
+        return {}
+    return saved
+
+
+def settings():
+    """Effective ``{"intra_op", "inter_op", "opencv", "batch_size"}`` for this process"""
+    global _settings
+    if _settings is None:
+        merged = defaults()
+        merged.update({k: v for k, v in tuned().items() if k in merged})
+        for key, env in ENV_OVERRIDES.items():
+            if os.environ.get(env):
+                merged[key] = int(os.environ[env])
+        _settings = merged
+    return _settings
+
+
+def configure_torch():
+    import torch
+
+    s = settings()
+    torch.set_num_threads(s["intra_op"])
+    try:
+        torch.set_num_interop_threads(s["inter_op"])
+    except RuntimeError:
+        pass  # can only be set before the first parallel operation; keep what is there
+
+
+def configure_tensorflow():
+    import tensorflow as tf
+
+    s = settings()
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(s["intra_op"])
+        tf.config.threading.set_inter_op_parallelism_threads(s["inter_op"])
+    except RuntimeError:
+        pass  # TensorFlow is already initialised; its pools are fixed for this process
+
+
+def configure_opencv():
+    import cv2
+
+    cv2.setNumThreads(settings()["opencv"])
+
+
+def probe(backend, batch_sizes, repeats):
+    """Time the loaded models at each batch size in this (fresh) process and print one JSON line"""
+    import numpy as np
+
+    from clearsight import models
+    from clearsight.pipeline import screen_preprocessed
+
+    gate, stager = models.load_models(backend)
+    models.warm_up(gate, stager)
+    results = []
+    for batch_size in batch_sizes:
+        binary = np.random.rand(batch_size, 3, config.BINARY_INPUT_SIZE, config.BINARY_INPUT_SIZE).astype(np.float32)
+        dr = np.random.rand(batch_size, config.DR_INPUT_SIZE, config.DR_INPUT_SIZE, 3).astype(np.float32)
+        screen_preprocessed(gate, stager, binary, dr)  # first call at a new shape may retrace
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            screen_preprocessed(gate, stager, binary, dr)
+            times.append(time.perf_counter() - start)
+        p50 = sorted(times)[len(times) // 2]
+        results.append({"batch_size": batch_size, "p50_ms": round(p50 * 1000, 1),
+                        "images_per_s": round(batch_size / p50, 2)})
+    print(json.dumps({"intra_op": settings()["intra_op"], "results": results}))
+
+
+def thread_candidates(cpus):
+    candidates, n = [], 1
+    while n < cpus:
+        candidates.append(n)
+        n *= 2
+    return candidates + [cpus]
+
+
+def autotune(backend=None, batch_sizes=AUTOTUNE_BATCH_SIZES, repeats=5, max_latency_ms=None, path=None):
+    """Sweep intra-op threads (one fresh process each) and batch sizes; persist and return the fastest"""
+    cpus = available_cpus()
+    model_cpus, opencv = budget(cpus)
+    best = None
+    for intra_op in thread_candidates(model_cpus):
+        env = dict(os.environ, CLEARSIGHT_INTRA_OP_THREADS=str(intra_op), CLEARSIGHT_INTER_OP_THREADS="1")
+        code = f"from clearsight.threads import probe; probe({backend!r}, {list(batch_sizes)!r}, {repeats})"
+        out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                             capture_output=True, text=True).stdout
+        run = json.loads(out.strip().splitlines()[-1])
+        for r in run["results"]:
+            print(f"threads={intra_op:<3} batch={r['batch_size']:<3} p50={r['p50_ms']:>8.1f} ms "
+                  f"{r['images_per_s']:>8.2f} img/s")
+            if max_latency_ms is not None and r["p50_ms"] > max_latency_ms:
+                continue
+            if best is None or r["images_per_s"] > best["images_per_s"]:
+                best = dict(r, intra_op=intra_op)
+    if best is None:
+        raise RuntimeError(f"No configuration met the {max_latency_ms} ms latency limit")
+
+    tuned = {"intra_op": best["intra_op"], "inter_op": 1, "opencv": opencv, "batch_size": best["batch_size"],
+             "images_per_s": best["images_per_s"], "p50_ms": best["p50_ms"], "cpus": cpus,
+             "backend": backend or config.BACKEND, "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    path = path or config.THREAD_SETTINGS_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(tuned, f, indent=2)
+    os.replace(tmp, path)
+    return tuned
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.threads", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    tune = commands.add_parser("autotune", help="sweep thread and batch settings and persist the fastest")
+    tune.add_argument("--backend", default=None, choices=["native", "mmap", "onnx"])
+    tune.add_argument("--batch-sizes", type=int, nargs="+", default=AUTOTUNE_BATCH_SIZES)
+    tune.add_argument("--repeats", type=int, default=5)
+    tune.add_argument("--max-latency-ms", type=float, default=None,
+                      help="ignore configurations whose p50 batch latency is above this")
+    args = parser.parse_args(argv)
+
+    if args.command == "autotune":
+        tuned = autotune(args.backend, args.batch_sizes, args.repeats, args.max_latency_ms)
+        print(f"Saved to {config.THREAD_SETTINGS_PATH}: {json.dumps(tuned)}")
+        return 0
+
+    print(f"cgroup quota: {cpu_quota() or 'unlimited'}, usable CPUs: {available_cpus()}")
+    print(json.dumps(settings(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
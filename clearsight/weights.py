@@ -0,0 +1,112 @@
+"""Memory-mapped model weights.
+
+    python -m clearsight.weights
+
+One-time conversion of the native checkpoints (the PyTorch ``.pth`` pickle and
+the Keras ``.h5``) to flat weight files that load without deserialisation.
+
+The files use the safetensors layout: an 8-byte little-endian header length, a
+JSON header giving each tensor's dtype, shape and byte range, then the raw
+tensor data. ``map_tensors`` maps the file copy-on-write and returns numpy
+views into it, so nothing is read until a page is touched and every process
+on the host shares the same page-cache pages. The Keras architecture is stored
+in the header metadata so the DR model can be rebuilt without the ``.h5``.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from clearsight import config
+
+# safetensors dtype names
+DTYPES = {
+    "F64": np.float64, "F32": np.float32, "F16": np.float16,
+    "I64": np.int64, "I32": np.int32, "I16": np.int16, "I8": np.int8,
+    "U8": np.uint8, "BOOL": np.bool_,
+}
+_DTYPE_NAMES = {np.dtype(v): k for k, v in DTYPES.items()}
+
+
+def write_tensors(tensors, path, metadata=None):
+    """Write ``{name: array}`` to ``path``; ``metadata`` is a ``{str: str}`` dict kept in the header"""
+    arrays = {name: np.ascontiguousarray(a) for name, a in tensors.items()}
+    # Widest dtypes first keeps every tensor aligned to its item size
+    order = sorted(arrays, key=lambda name: (-arrays[name].dtype.itemsize, name))
+
+    header, offset = {}, 0
+    for name in order:
+        a = arrays[name]
+        header[name] = {"dtype": _DTYPE_NAMES[a.dtype], "shape": list(a.shape),
+                        "data_offsets": [offset, offset + a.nbytes]}
+        offset += a.nbytes
+    if metadata:
+        header["__metadata__"] = metadata
+    blob = json.dumps(header, separators=(",", ":")).encode()
+    blob += b" " * (-len(blob) % 8)  # data section starts 8-byte aligned
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack("<Q", len(blob)))
+        f.write(blob)
+        for name in order:
+            f.write(arrays[name].tobytes())
+    os.replace(tmp, path)
+
+
+def map_tensors(path):
+    """Return ``({name: array}, metadata)`` with every array a zero-copy view of the mapped file.
+
+    The mapping is copy-on-write: pages stay shared with the page cache unless
+    a caller writes to them, and writes never reach the file.
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    (length,) = struct.unpack("<Q", buf[:8])
+    header = json.loads(buf[8:8 + length])
+    metadata = header.pop("__metadata__", {})
+    start = 8 + length
+
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        dtype = np.dtype(DTYPES[info["dtype"]])
+        tensors[name] = np.frombuffer(buf, dtype=dtype, count=(end - begin) // dtype.itemsize,
+                                      offset=start + begin).reshape(info["shape"])
+    return tensors, metadata
+
+
+def convert_gate(binary_model, path=config.BINARY_WEIGHTS_PATH):
+    """Write the PyTorch gate's state dict (parameters and buffers)"""
+    tensors = {name: t.detach().cpu().numpy() for name, t in binary_model.state_dict().items()}
+    write_tensors(tensors, path, {"architecture": "densenet121", "num_classes": "2"})
+
+
+def convert_stager(dr_model, path=config.DR_WEIGHTS_PATH):
+    """Write the Keras DR model's weights in ``get_weights`` order, with its architecture as JSON"""
+    tensors = {f"{i:04d}": w for i, w in enumerate(dr_model.get_weights())}
+    write_tensors(tensors, path, {"keras_model": dr_model.to_json()})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m clearsight.weights", description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    from clearsight import models, provision
+
+    provision.ensure(config.BINARY_MODEL_PATH)
+    provision.ensure(config.DR_MODEL_PATH)
+    convert_gate(models.load_binary_model())
+    print(f"Wrote {config.BINARY_WEIGHTS_PATH}")
+    convert_stager(models.load_dr_model())
+    print(f"Wrote {config.DR_WEIGHTS_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Lets ``pytest`` import the ``clearsight`` package from the repository root."""
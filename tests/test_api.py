@@ -0,0 +1,54 @@
+"""HTTP API error paths that need no models"""
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from clearsight import api, config
+
+
+@pytest.fixture
+def server():
+    server = api.make_server("127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_malformed_content_length_is_a_bad_request(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    conn.putrequest("POST", "/v1/screen")
+    conn.putheader("Content-Length", "twelve")
+    conn.endheaders()
+    response = conn.getresponse()
+
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length header"}
+
+
+def test_api_port_in_use_is_reported_once(monkeypatch, capsys):
+    taken = socket.socket()
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    monkeypatch.setattr(config, "API_HOST", "127.0.0.1")
+    monkeypatch.setattr(config, "API_PORT", taken.getsockname()[1])
+    monkeypatch.setattr(api, "_server", None)
+    attempts = []
+    make_server = api.make_server
+
+    def counting_make_server():
+        attempts.append(config.API_PORT)
+        return make_server(config.API_HOST, config.API_PORT)
+
+    monkeypatch.setattr(api, "make_server", counting_make_server)
+    try:
+        assert api.ensure_api_server() is None
+        assert api.ensure_api_server() is None
+    finally:
+        taken.close()
+
+    assert len(attempts) == 1
+    assert "ClearSight API not served" in capsys.readouterr().err
@@ -0,0 +1,79 @@
+"""ModelRegistry loading and its failure path"""
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from clearsight import batching, cache, config, models  # noqa: E402
+
+
+class StubModel:
+    def predict(self, batch):
+        return batch
+
+
+class StubCache:
+    instances = []
+
+    def __init__(self, version):
+        self.closed = False
+        StubCache.instances.append(self)
+
+    def close(self):
+        self.closed = True
+
+
+def batcher_threads():
+    return [t for t in threading.enumerate() if t.name == "clearsight-microbatcher"]
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(config, "RESULT_CACHE", True)
+    monkeypatch.setattr(config, "MICROBATCH", True)
+    monkeypatch.setattr(models, "load_models", lambda: (StubModel(), StubModel()))
+    monkeypatch.setattr(models, "warm_up", lambda binary_model, dr_model: None)
+    monkeypatch.setattr(models, "model_files", lambda: ())
+    monkeypatch.setattr(cache, "model_version", lambda paths: "v")
+    monkeypatch.setattr(cache, "ResultCache", StubCache)
+    StubCache.instances = []
+    registry = models.ModelRegistry()
+    yield registry
+    if registry.batcher is not None:
+        registry.batcher.close()
+
+
+def test_failed_load_releases_what_it_created(registry, monkeypatch):
+    def broken_batcher(*args):
+        raise RuntimeError("no batcher")
+
+    monkeypatch.setattr(batching, "MicroBatcher", broken_batcher)
+    with pytest.raises(RuntimeError):
+        registry.load()
+
+    assert registry.status == models.FAILED
+    assert registry.result_cache is None and registry.batcher is None
+    assert [c.closed for c in StubCache.instances] == [True]
+
+
+def test_retry_after_failure_starts_one_batcher(registry, monkeypatch):
+    def failing_load():
+        raise OSError("download failed")
+
+    before = len(batcher_threads())
+    load_models = models.load_models
+    monkeypatch.setattr(models, "load_models", failing_load)
+    with pytest.raises(OSError):
+        registry.load()
+    assert len(batcher_threads()) == before
+
+    monkeypatch.setattr(models, "load_models", load_models)
+    registry.load()
+    registry.load()
+    assert registry.status == models.LOADED
+    assert len(batcher_threads()) == before + 1
+
+    registry.batcher.close()
+    registry.batcher = None
+    assert len(batcher_threads()) == before
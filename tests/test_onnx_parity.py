@@ -0,0 +1,30 @@
+"""Native and ONNX backends must agree on every gate decision and DR stage"""
+import os
+
+import pytest
+
+from clearsight import config
+
+for module in ("PIL", "numpy", "onnxruntime", "torch", "torchvision", "tensorflow"):
+    pytest.importorskip(module)
+
+MODEL_FILES = [config.BINARY_MODEL_PATH, config.DR_MODEL_PATH, config.BINARY_ONNX_PATH, config.DR_ONNX_PATH]
+missing = [path for path in MODEL_FILES if not os.path.exists(path)]
+if missing:
+    pytest.skip(f"model files not present: {', '.join(missing)}", allow_module_level=True)
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """``sample_images/`` when the checkout has it, otherwise a few synthetic fundus images"""
+    if os.path.isdir(config.SAMPLE_IMAGES_DIR) and os.listdir(config.SAMPLE_IMAGES_DIR):
+        return config.SAMPLE_IMAGES_DIR
+    from clearsight.export_onnx import synthetic_images
+
+    return synthetic_images(str(tmp_path))
+
+
+def test_native_and_onnx_agree(image_dir):
+    from clearsight.export_onnx import check_parity
+
+    assert check_parity(image_dir) == 0
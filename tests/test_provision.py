@@ -0,0 +1,154 @@
+"""Model provisioning against a local HTTP file server"""
+import hashlib
+import io
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from clearsight import provision
+
+
+def model_bytes(size=200_000):
+    """A complete torch-style zip, so the format check passes"""
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as z:
+        z.writestr("archive/data.pkl", bytes(range(256)) * (size // 256))
+    return out.getvalue()
+
+
+def entry_for(data, url=None):
+    return {"url": url, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+class FileServer:
+    """Serves ``files`` with Range support; paths in ``cut_once`` drop the connection halfway the first time"""
+
+    def __init__(self):
+        self.files = {}
+        self.cut_once = set()
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append((self.path, self.headers.get("Range")))
+                data = server.files.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                start = 0
+                if self.headers.get("Range"):
+                    start = int(self.headers["Range"].split("=")[1].split("-")[0])
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data) - start))
+                self.end_headers()
+                body = data[start:]
+                if self.path in server.cut_once:
+                    server.cut_once.discard(self.path)
+                    body = body[:len(body) // 2]
+                    self.close_connection = True
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with FileServer() as s:
+        yield s
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(provision.time, "sleep", lambda seconds: None)
+
+
+def test_interrupted_download_resumes_with_range(server, tmp_path):
+    data = model_bytes()
+    server.files["/model.pth"] = data
+    server.cut_once.add("/model.pth")
+    manifest = {"model.pth": entry_for(data, f"{server.url}/model.pth")}
+
+    path = provision.fetch("model.pth", str(tmp_path), manifest, mirror="")
+
+    assert open(path, "rb").read() == data
+    assert [r for _, r in server.requests] == [None, f"bytes={len(data) // 2}-"]
+    assert not (tmp_path / "model.pth.part").exists()
+
+
+def test_missing_mirror_file_falls_back_to_manifest_url_without_retrying(server, tmp_path):
+    data = model_bytes()
+    server.files["/origin/model.pth"] = data
+    manifest = {"model.pth": entry_for(data, f"{server.url}/origin/model.pth")}
+
+    path = provision.fetch("model.pth", str(tmp_path), manifest, mirror=f"{server.url}/mirror")
+
+    assert open(path, "rb").read() == data
+    assert [p for p, _ in server.requests] == ["/mirror/model.pth", "/origin/model.pth"]
+
+
+def test_checksum_mismatch_is_rejected(server, tmp_path):
+    data = model_bytes()
+    server.files["/model.pth"] = data
+    entry = entry_for(data, f"{server.url}/model.pth")
+    entry["sha256"] = "0" * 64
+
+    with pytest.raises(provision.ProvisionError, match="sha256"):
+        provision.fetch("model.pth", str(tmp_path), {"model.pth": entry}, mirror="", retries=2)
+
+    assert not (tmp_path / "model.pth").exists()
+    assert not (tmp_path / "model.pth.part").exists()
+
+
+def test_unpinned_entry_is_refused_when_opted_out(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(provision.config, "ALLOW_UNPINNED_MODELS", False)
+    server.files["/model.pth"] = model_bytes()
+    manifest = {"model.pth": {"url": f"{server.url}/model.pth", "sha256": None, "size": None}}
+
+    with pytest.raises(provision.ProvisionError, match="No sha256 pinned"):
+        provision.fetch("model.pth", str(tmp_path), manifest, mirror="")
+    assert server.requests == []
+
+
+def test_unpinned_file_on_disk_is_used_after_a_format_check(tmp_path):
+    data = model_bytes()
+    (tmp_path / "model.pth").write_bytes(data)
+    manifest = {"model.pth": {"url": None, "sha256": None, "size": None}}
+
+    assert provision.fetch("model.pth", str(tmp_path), manifest, mirror="") == str(tmp_path / "model.pth")
+
+    (tmp_path / "model.pth").write_bytes(data[:len(data) // 2])
+    assert not provision.is_valid(str(tmp_path / "model.pth"), manifest["model.pth"])
+
+
+def test_verified_file_in_read_only_directory(tmp_path, monkeypatch):
+    data = model_bytes()
+    (tmp_path / "model.pth").write_bytes(data)
+    real_open = open
+
+    def read_only_open(file, mode="r", *args, **kwargs):
+        if "w" in mode:
+            raise PermissionError(13, "Read-only file system", file)
+        return real_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", read_only_open)
+    assert provision.is_valid(str(tmp_path / "model.pth"), entry_for(data))
@@ -0,0 +1,39 @@
+"""Resumable result writers of the headless screener"""
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from clearsight.screen import COLUMNS, CsvResultWriter, ParquetResultWriter  # noqa: E402
+
+
+def row(path, error=None):
+    return dict.fromkeys(COLUMNS) | {"path": path, "accepted": error is None, "error": error}
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def writer(request, tmp_path):
+    if request.param == "csv":
+        return lambda: CsvResultWriter(str(tmp_path / "results.csv"))
+    pytest.importorskip("pyarrow")
+    return lambda: ParquetResultWriter(str(tmp_path / "results.parquet"))
+
+
+def test_failed_images_are_not_done(writer):
+    writer().write([row("a.jpg"), row("b.jpg", error="OSError: truncated file")])
+    assert writer().done_paths() == {"a.jpg"}
+
+
+def test_parts_after_a_gap_never_overwrite_existing_ones(tmp_path):
+    pytest.importorskip("pyarrow")
+    out = str(tmp_path / "results.parquet")
+    first = ParquetResultWriter(out)
+    for name in "abc":
+        first.write([row(f"{name}.jpg")])
+    os.remove(os.path.join(out, "part-000001.parquet"))
+
+    ParquetResultWriter(out).write([row("d.jpg")])
+
+    assert sorted(os.listdir(out)) == ["part-000000.parquet", "part-000002.parquet", "part-000003.parquet"]
+    assert ParquetResultWriter(out).done_paths() == {"a.jpg", "c.jpg", "d.jpg"}
@@ -0,0 +1,14 @@
+"""The Dashboard's cold import cost stays within the startup budget"""
+import pytest
+
+from clearsight import startup
+
+pytest.importorskip("streamlit")
+
+
+def test_dashboard_imports_within_budget():
+    result = startup.measure(startup.ENTRY_PAGE, repeats=3)
+    assert result["import_ms"] <= startup.DEFAULT_BUDGET_MS, (
+        f"{startup.ENTRY_PAGE} imports in {result['import_ms']:.0f} ms "
+        f"(heavy modules: {', '.join(result['heavy']) or 'none'}), over the {startup.DEFAULT_BUDGET_MS:.0f} ms budget"
+    )
@@ -0,0 +1,41 @@
+"""Thread budget split and persisted autotune settings"""
+import json
+
+import pytest
+
+from clearsight import config, threads
+
+
+@pytest.mark.parametrize("cpus, expected", [(1, (1, 0)), (2, (1, 1)), (4, (3, 1)), (16, (12, 4))])
+def test_budget_never_exceeds_the_cpus(cpus, expected):
+    assert threads.budget(cpus) == expected
+    assert sum(threads.budget(cpus)) <= cpus
+
+
+@pytest.fixture
+def tuned_file(tmp_path, monkeypatch):
+    path = tmp_path / "threads.json"
+    monkeypatch.setattr(config, "THREAD_SETTINGS_PATH", str(path))
+    monkeypatch.setattr(config, "BACKEND", "onnx")
+    monkeypatch.setattr(threads, "available_cpus", lambda: 4)
+    monkeypatch.setattr(threads, "_settings", None)
+    for env in threads.ENV_OVERRIDES.values():
+        monkeypatch.delenv(env, raising=False)
+
+    def write(**fields):
+        path.write_text(json.dumps({"intra_op": 2, "inter_op": 1, "opencv": 1, "batch_size": 16} | fields))
+
+    return write
+
+
+def test_settings_tuned_for_this_host_are_applied(tuned_file):
+    tuned_file(cpus=4, backend="onnx")
+    assert threads.settings()["intra_op"] == 2
+    assert threads.settings()["batch_size"] == 16
+
+
+@pytest.mark.parametrize("fields", [{"cpus": 16, "backend": "onnx"}, {"cpus": 4, "backend": "native"}, {}])
+def test_settings_tuned_elsewhere_are_ignored(tuned_file, fields, capsys):
+    tuned_file(**fields)
+    assert threads.settings() == threads.defaults()
+    assert "Ignoring" in capsys.readouterr().err